@@ -0,0 +1,61 @@
+"""Compare stream resolve latency with a fresh YoutubeDL per call against the warm extractor pool
+
+    python benchmarks/resolve_latency.py [video_id ...] [--rounds N]
+
+Needs network access. The stream cache is bypassed so every call really runs yt-dlp.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import yt_dlp
+from components.extractor_pool import AUDIO_OPTIONS, ExtractorPool
+
+DEFAULT_VIDEO_IDS = ["jNQXAC9IVRw", "dQw4w9WgXcQ", "kJQP7kiw5Fk"]
+
+def resolve_cold(video_id):
+    with yt_dlp.YoutubeDL(AUDIO_OPTIONS) as ydl:
+        ydl.extract_info(f"https://www.youtube.com/watch?v={video_id}", download=False)
+
+def make_resolve_warm(pool):
+    def resolve_warm(video_id):
+        with pool.borrow() as ydl:
+            ydl.extract_info(f"https://www.youtube.com/watch?v={video_id}", download=False)
+    return resolve_warm
+
+def measure(resolve, video_ids, rounds):
+    timings = []
+    for _ in range(rounds):
+        for video_id in video_ids:
+            start = time.perf_counter()
+            resolve(video_id)
+            timings.append(time.perf_counter() - start)
+    return timings
+
+def report(name, timings):
+    timings = sorted(timings)
+    p90 = timings[min(len(timings) - 1, int(len(timings) * 0.9))]
+    print(f"{name:>5}: n={len(timings)} min={timings[0] * 1000:.0f}ms median={statistics.median(timings) * 1000:.0f}ms "
+          f"p90={p90 * 1000:.0f}ms max={timings[-1] * 1000:.0f}ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("video_ids", nargs="*", default=DEFAULT_VIDEO_IDS)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    report("cold", measure(resolve_cold, args.video_ids, args.rounds))
+
+    pool = ExtractorPool(size=1)
+    pool.warm()
+    resolve_warm = make_resolve_warm(pool)
+    resolve_warm(args.video_ids[0])  # The first call through an instance still fetches the player code
+    report("warm", measure(resolve_warm, args.video_ids, args.rounds))
+    pool.close()
+
+if __name__ == "__main__":
+    main()
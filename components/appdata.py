@@ -0,0 +1,18 @@
+import os
+import sys
+
+APP_NAME = "HiFi"
+
+def app_data_dir(*parts):
+    """ Get a per-user directory for persistent caches, works for dev and for PyInstaller """
+    base = os.getenv("HIFI_DATA_DIR")
+    if not base:
+        if sys.platform == "win32":
+            base = os.path.join(os.getenv("LOCALAPPDATA") or os.path.expanduser("~"), APP_NAME)
+        elif sys.platform == "darwin":
+            base = os.path.join(os.path.expanduser("~/Library/Application Support"), APP_NAME)
+        else:
+            base = os.path.join(os.getenv("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), APP_NAME.lower())
+    path = os.path.join(base, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
@@ -0,0 +1,223 @@
+import os
+import queue
+import sqlite3
+import threading
+import time
+from components import http_client
+from components.appdata import app_data_dir
+from components.format_policy import get_throughput_meter
+
+MB = 1024 * 1024
+DEFAULT_BUDGET = int(os.getenv("HIFI_AUDIO_CACHE_MB", "500")) * MB
+CHUNK_SIZE = 10 * MB  # googlevideo throttles single huge requests, ranged chunks download at full speed
+MAX_PENDING = 4  # Downloads waiting behind the current one
+EXTENSIONS = {"opus": "webm", "mp4a": "m4a"}
+
+class AudioCache:
+    """Downloaded audio files by video id, least recently played evicted first past a byte budget"""
+
+    def __init__(self, directory=None, budget=DEFAULT_BUDGET):
+        self.directory = directory or app_data_dir("audio")
+        self.budget = budget
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(self.directory, "index.db"), check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                video_id TEXT PRIMARY KEY,
+                filename TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_played REAL NOT NULL,
+                title TEXT,
+                artist TEXT,
+                thumbnail BLOB
+            );
+            CREATE TABLE IF NOT EXISTS counters (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+        """)
+        self.conn.commit()
+        self.pending = queue.Queue(MAX_PENDING)
+        self.queued = set()
+        self.writer = None
+        self.stopping = False
+
+    def lookup(self, video_id):
+        """Return a cached track in AudioLoaderThread's data shape, or None"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT filename, size, title, artist, thumbnail FROM entries WHERE video_id = ?", (video_id,)
+            ).fetchone()
+            if row is None or not os.path.exists(os.path.join(self.directory, row[0])):
+                if row is not None:  # The file was removed behind our back
+                    self.conn.execute("DELETE FROM entries WHERE video_id = ?", (video_id,))
+                self.count("misses")
+                self.conn.commit()
+                return None
+            filename, size, title, artist, thumbnail = row
+            self.conn.execute("UPDATE entries SET last_played = ? WHERE video_id = ?", (time.time(), video_id))
+            self.count("hits")
+            self.count("bytes_saved", size)
+            self.conn.commit()
+        return {
+            "video_id": video_id,
+            "audio_path": os.path.join(self.directory, filename),
+            "track_name": title,
+            "artist_name": artist,
+            "thumbnail_data": thumbnail or b"",
+            "cached": True,
+        }
+
+    def count(self, name, amount=1):
+        self.conn.execute("""
+            INSERT INTO counters (name, value) VALUES (?, ?)
+            ON CONFLICT (name) DO UPDATE SET value = value + excluded.value
+        """, (name, amount))
+
+    def stats(self):
+        """Counters plus current usage, e.g. for logging"""
+        with self.lock:
+            counters = dict(self.conn.execute("SELECT name, value FROM counters").fetchall())
+            files, size = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return {
+            "hits": counters.get("hits", 0),
+            "misses": counters.get("misses", 0),
+            "bytes_saved": counters.get("bytes_saved", 0),
+            "evictions": counters.get("evictions", 0),
+            "files": files,
+            "bytes": size,
+            "budget": self.budget,
+        }
+
+    def schedule(self, track):
+        """Download a track that's playing from the network in the background, at most one at a time
+
+        Tracks played through the stream proxy are stored by it once fully read, see store().
+        """
+        video_id = track["video_id"]
+        if track.get("cached") or track.get("via_proxy") or video_id in self.queued or self.stopping:
+            return
+        with self.lock:
+            if self.conn.execute("SELECT 1 FROM entries WHERE video_id = ?", (video_id,)).fetchone():
+                return
+        try:
+            self.pending.put_nowait(track)
+        except queue.Full:
+            return
+        self.queued.add(video_id)
+        if self.writer is None:
+            self.writer = threading.Thread(target=self.write_loop, daemon=True)
+            self.writer.start()
+
+    def write_loop(self):
+        while not self.stopping:
+            track = self.pending.get()
+            if track is None:
+                return
+            try:
+                self.download(track)
+            except Exception as e:
+                print(f"AudioCache: Failed to cache {track['video_id']}: {e}")
+            finally:
+                self.queued.discard(track["video_id"])
+
+    def filename_for(self, track):
+        return f"{track['video_id']}.{EXTENSIONS.get(track.get('codec'), 'audio')}"
+
+    def store(self, track, data):
+        """Add a track whose bytes were already read in full, e.g. by the stream proxy"""
+        if len(data) > self.budget:
+            return
+        filename = self.filename_for(track)
+        path = os.path.join(self.directory, filename)
+        with open(path + ".part", "wb") as f:
+            f.write(data)
+        os.replace(path + ".part", path)
+        self.add_entry(track, filename, len(data))
+
+    def download(self, track):
+        filename = self.filename_for(track)
+        path = os.path.join(self.directory, filename)
+        part = path + ".part"
+        size = 0
+        try:
+            with open(part, "wb") as f:
+                while not self.stopping:
+                    start = time.perf_counter()
+                    response = http_client.get(
+                        track["audio_url"], stream=True,
+                        headers={"Range": f"bytes={size}-{size + CHUNK_SIZE - 1}"}
+                    )
+                    response.raise_for_status()
+                    received = 0
+                    for block in response.iter_content(256 * 1024):
+                        if self.stopping:
+                            break
+                        f.write(block)
+                        received += len(block)
+                    get_throughput_meter().record(received, time.perf_counter() - start)
+                    size += received
+                    total = response.headers.get("Content-Range", "").rpartition("/")[2]
+                    if received < CHUNK_SIZE or (total.isdigit() and size >= int(total)):
+                        break
+            if self.stopping:
+                raise Exception("Shutting down")
+            os.replace(part, path)
+        except Exception:
+            if os.path.exists(part):
+                os.remove(part)
+            raise
+        self.add_entry(track, filename, size)
+
+    def add_entry(self, track, filename, size):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO entries (video_id, filename, size, last_played, title, artist, thumbnail) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (track["video_id"], filename, size, time.time(), track.get("track_name"), track.get("artist_name"), track.get("thumbnail_data"))
+            )
+            self.conn.commit()
+        print(f"AudioCache: Cached {track['video_id']} ({size / MB:.1f} MB)")
+        self.evict()
+
+    def set_thumbnail(self, video_id, data):
+        """Fill in the thumbnail of an entry stored before it was downloaded"""
+        with self.lock:
+            self.conn.execute("UPDATE entries SET thumbnail = ? WHERE video_id = ?", (data, video_id))
+            self.conn.commit()
+
+    def evict(self):
+        """Delete least recently played files until the cache fits its budget"""
+        with self.lock:
+            total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total <= self.budget:
+                return
+            for video_id, filename, size in self.conn.execute(
+                "SELECT video_id, filename, size FROM entries ORDER BY last_played"
+            ).fetchall():
+                if total <= self.budget:
+                    break
+                try:
+                    os.remove(os.path.join(self.directory, filename))
+                except FileNotFoundError:
+                    pass
+                self.conn.execute("DELETE FROM entries WHERE video_id = ?", (video_id,))
+                self.count("evictions")
+                total -= size
+            self.conn.commit()
+
+    def shutdown(self):
+        self.stopping = True
+        try:
+            self.pending.put_nowait(None)
+        except queue.Full:
+            pass
+
+_audio_cache = None
+_audio_cache_lock = threading.Lock()
+
+def get_audio_cache():
+    global _audio_cache
+    with _audio_cache_lock:
+        if _audio_cache is None:
+            _audio_cache = AudioCache()
+    return _audio_cache
@@ -3,6 +3,7 @@ from PySide6.QtCore import Signal, Qt
 
 class ClickableImage(QLabel):
     clicked = Signal(str)  # Emit the track ID when clicked
+    hovered = Signal(str)  # Emit the track ID when the pointer enters
 
     def __init__(self, track_id="", parent=None):
         super().__init__(parent)
@@ -11,3 +12,7 @@ class ClickableImage(QLabel):
 
     def mousePressEvent(self, event):
         self.clicked.emit(self.track_id)  # Emit track_id as a string
+
+    def enterEvent(self, event):
+        self.hovered.emit(self.track_id)
+        super().enterEvent(event)
@@ -0,0 +1,254 @@
+import multiprocessing
+import threading
+import time
+
+WORKER_COUNT = 2  # Same as the in-process extractor pool: one for clicks, one for prefetches
+# Background work (warm-up, prefetches, the next track) never holds the last worker, it's kept for clicks
+JOB_TIMEOUT = 30  # Seconds before a resolve counts as hung and its worker is killed
+WARMUP_TIMEOUT = 60
+ACQUIRE_TIMEOUT = 60  # Seconds to wait for a free worker, two job timeouts
+MAX_JOBS_PER_WORKER = 100  # Fresh process after this many resolves, yt-dlp's memory use only grows
+
+class ExtractionTimeout(Exception):
+    pass
+
+def _worker_main(conn):
+    """Child process loop: resolve jobs from the pipe with a warm in-process extractor"""
+    from components.extractor_pool import ExtractorPool
+    from components.format_policy import audio_bitrate, codec_of, select_audio_format
+    pool = ExtractorPool(size=1)
+    pool.warm()
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            return
+        if job is None:
+            return
+        kind, video_id, max_abr, itag = job
+        try:
+            if kind == "warm_up":
+                pool.warm_up(video_id)
+                conn.send(("ok", None))
+                continue
+            with pool.borrow() as ydl:
+                info = ydl.extract_info(f"https://www.youtube.com/watch?v={video_id}", download=False)
+            if itag:
+                # The caller already streams this format and needs byte offsets to line up
+                fmt = next((fmt for fmt in info.get("formats") or [] if fmt.get("format_id") == itag), None)
+                if fmt is None:
+                    raise Exception(f"Format {itag} is no longer offered for {video_id}")
+            else:
+                fmt = select_audio_format(info.get("formats") or [], max_abr) or info
+            conn.send(("ok", {
+                "title": info.get("title"),
+                "artist": info.get("uploader"),
+                "thumbnail": info.get("thumbnail"),
+                "audio_url": fmt.get("url"),
+                "video_url": info.get("webpage_url"),
+                "itag": fmt.get("format_id"),
+                "codec": codec_of(fmt),
+                "abr": audio_bitrate(fmt),
+            }))
+        except Exception as e:
+            conn.send(("error", str(e)))
+
+class _Worker:
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.jobs = 0
+
+    def run(self, job, timeout):
+        self.conn.send(job)
+        if not self.conn.poll(timeout):
+            raise ExtractionTimeout(f"Extraction of {job[1]} took longer than {timeout}s")
+        status, payload = self.conn.recv()
+        self.jobs += 1
+        if status == "error":
+            raise Exception(payload)
+        return payload
+
+    def stop(self, grace=1.0):
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(grace)
+        self.kill()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(1.0)
+        self.conn.close()
+
+class ExtractionService:
+    """Runs yt-dlp extraction in worker processes so it can't hold the GUI's GIL and can be killed when it hangs
+
+    Callers block on a pipe (which releases the GIL) from their own thread, e.g.
+    AudioLoaderThread, and get the result back there to emit as a Qt signal.
+    """
+
+    def __init__(self, workers=WORKER_COUNT, job_timeout=JOB_TIMEOUT, max_jobs=MAX_JOBS_PER_WORKER):
+        # Spawn on every platform, forking a process that has Qt threads running isn't safe
+        self.context = multiprocessing.get_context("spawn")
+        self.size = workers
+        self.job_timeout = job_timeout
+        self.max_jobs = max_jobs
+        self.idle = []  # Most recently used last, it's the warmest
+        self.lock = threading.Lock()
+        self.changed = threading.Condition(self.lock)  # A worker went idle or retired
+        self.created = 0
+        self.busy = set()
+        self.closed = False
+        self.background_limit = max(1, workers - 1)
+        self.background_jobs = 0
+        self.background_done = threading.Condition(self.lock)
+
+    def acquire(self, block=True, timeout=ACQUIRE_TIMEOUT):
+        """Take an idle worker or start a new one; waits for either when all are busy"""
+        deadline = time.monotonic() + timeout
+        with self.changed:
+            while True:
+                if self.closed:
+                    raise RuntimeError("Extraction service is shut down")
+                if self.idle:
+                    return self.idle.pop()
+                if self.created < self.size:
+                    # Also reached when a killed worker freed its slot, the waiter starts the replacement
+                    self.created += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if not block:
+                    return None
+                if remaining <= 0:
+                    raise ExtractionTimeout(f"No extraction worker became free within {timeout}s")
+                self.changed.wait(remaining)
+        try:
+            return _Worker(self.context)
+        except Exception:
+            with self.changed:
+                self.created -= 1
+                self.changed.notify()
+            raise
+
+    def release(self, worker, healthy):
+        with self.changed:
+            self.busy.discard(worker)
+            retire = self.closed or not healthy or worker.jobs >= self.max_jobs
+            if retire:
+                self.created -= 1
+            else:
+                self.idle.append(worker)
+            self.changed.notify()
+        if not retire:
+            return
+        if healthy:
+            worker.stop()
+        else:
+            worker.kill()
+
+    def submit(self, kind, video_id, timeout, worker=None, max_abr=None, itag=None, background=False):
+        if background:
+            with self.background_done:
+                while self.background_jobs >= self.background_limit and not self.closed:
+                    self.background_done.wait()
+                self.background_jobs += 1
+        try:
+            worker = worker or self.acquire()
+        except Exception:
+            self.end_background(background)
+            raise
+        with self.lock:
+            self.busy.add(worker)
+        healthy = False
+        try:
+            result = worker.run((kind, video_id, max_abr, itag), timeout)
+            healthy = True
+            return result
+        except ExtractionTimeout:
+            print(f"ExtractionService: {video_id} timed out, restarting its worker")
+            raise
+        except (EOFError, OSError) as e:
+            raise Exception(f"Extraction worker died: {e}")
+        except Exception:
+            healthy = worker.process.is_alive()  # yt-dlp errors are reported, the worker itself is fine
+            raise
+        finally:
+            self.release(worker, healthy)
+            self.end_background(background)
+
+    def end_background(self, background):
+        if background:
+            with self.background_done:
+                self.background_jobs -= 1
+                self.background_done.notify()
+
+    def extract(self, video_id, max_abr=None, itag=None, background=False):
+        """Resolve a video in a worker process, returning get_audio_info_by_id's dict
+
+        max_abr caps the audio bitrate (kbps) of the chosen format, see format_policy;
+        itag asks for exactly that format instead, failing if it's gone. Background
+        resolves queue for the workers not kept free for clicks.
+        """
+        return self.submit("resolve", video_id, self.job_timeout, max_abr=max_abr, itag=itag, background=background)
+
+    def warm_up(self, video_id=None):
+        """Start every worker, and have the background ones decipher the player once
+
+        The worker kept for clicks is only started: the deciphered player lands in
+        yt-dlp's on-disk cache, which it shares, and a click never waits on warm-up.
+        """
+        from components.extractor_pool import WARMUP_VIDEO_ID
+        video_id = video_id or WARMUP_VIDEO_ID
+        start = time.perf_counter()
+        # Take every worker that's free now so each one gets warmed, not the same one twice
+        workers = [worker for worker in (self.acquire(block=False) for _ in range(self.size)) if worker]
+        for worker in workers[self.background_limit:]:
+            self.release(worker, healthy=True)
+        workers = workers[:self.background_limit]
+        threads = [
+            threading.Thread(target=self.warm_worker, args=(video_id, worker), daemon=True)
+            for worker in workers
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        print(f"ExtractionService: Warm-up of {len(workers)} workers took {time.perf_counter() - start:.1f}s")
+
+    def warm_worker(self, video_id, worker):
+        try:
+            self.submit("warm_up", video_id, WARMUP_TIMEOUT, worker, background=True)
+        except Exception as e:
+            print(f"ExtractionService: Warm-up failed: {e}")
+
+    def shutdown(self):
+        with self.changed:
+            self.closed = True
+            busy = list(self.busy)
+            idle, self.idle = self.idle, []
+            self.changed.notify_all()
+            self.background_done.notify_all()
+        for worker in idle:
+            worker.stop()
+        for worker in busy:
+            worker.kill()
+
+_service = None
+_service_lock = threading.Lock()
+
+def get_extraction_service():
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = ExtractionService()
+    return _service
+
+def shutdown_extraction_service():
+    with _service_lock:
+        if _service is not None:
+            _service.shutdown()
@@ -0,0 +1,104 @@
+import queue
+import threading
+from contextlib import contextmanager
+import yt_dlp
+from components.appdata import app_data_dir
+
+AUDIO_OPTIONS = {
+    'format': 'bestaudio/best',
+    'quiet': True,
+    'noplaylist': True,
+    # Deciphered player functions are kept here across launches, a frozen build
+    # would otherwise get a fresh temp dir and redo them every time
+    'cachedir': app_data_dir('yt-dlp'),
+}
+WARMUP_VIDEO_ID = "jNQXAC9IVRw"  # Short, long-lived upload; any video exercises the same player code
+POOL_SIZE = 2  # Resolves are one per click, two covers a click landing during a prefetch
+MAX_USES = 200  # Recycle an instance after this many resolves so per-instance caches can't grow forever
+
+class ExtractorPool:
+    """Long-lived YoutubeDL instances lent out one caller at a time
+
+    A YoutubeDL keeps its extractors and the deciphered YouTube player code between
+    calls, so reusing one skips that setup on every resolve after the first.
+    """
+
+    def __init__(self, options=None, size=POOL_SIZE, max_uses=MAX_USES):
+        self.options = dict(options or AUDIO_OPTIONS)
+        self.size = size
+        self.max_uses = max_uses
+        self.idle = queue.LifoQueue()  # Most recently used first, it's the warmest
+        self.lock = threading.Lock()
+        self.created = 0
+        self.uses = {}
+
+    def create(self):
+        ydl = yt_dlp.YoutubeDL(self.options)
+        ydl.get_info_extractor("Youtube")  # Instantiate the extractor now rather than on first use
+        return ydl
+
+    def warm(self):
+        """Fill the pool up front so the first play doesn't pay for construction"""
+        while True:
+            with self.lock:
+                if self.created >= self.size:
+                    return
+                self.created += 1
+            ydl = self.create()
+            self.uses[id(ydl)] = 0
+            self.idle.put(ydl)
+
+    def warm_up(self, video_id=WARMUP_VIDEO_ID):
+        """Resolve one video so the current player code is deciphered and cached before anyone clicks"""
+        self.warm()
+        with self.borrow() as ydl:
+            ydl.extract_info(f"https://www.youtube.com/watch?v={video_id}", download=False)
+
+    @contextmanager
+    def borrow(self):
+        ydl = self.acquire()
+        try:
+            yield ydl
+        finally:
+            self.release(ydl)
+
+    def acquire(self):
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self.lock:
+            can_create = self.created < self.size
+            if can_create:
+                self.created += 1
+        if not can_create:
+            return self.idle.get()
+        ydl = self.create()
+        self.uses[id(ydl)] = 0
+        return ydl
+
+    def release(self, ydl):
+        uses = self.uses.pop(id(ydl), 0) + 1
+        if uses >= self.max_uses:
+            ydl.close()
+            ydl = self.create()
+            uses = 0
+        self.uses[id(ydl)] = uses
+        self.idle.put(ydl)
+
+    def close(self):
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_extractor_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ExtractorPool()
+    return _pool
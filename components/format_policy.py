@@ -0,0 +1,91 @@
+import os
+import threading
+
+# Highest audio bitrate (kbps) each profile will pick, None means no limit
+# YouTube's audio-only formats are about 50, 70 and 130-160 kbps opus (249, 250, 251) and 128 kbps aac (140)
+PROFILES = {
+    "data_saver": 64,
+    "balanced": 96,  # 250, the 128+ kbps formats are what max_quality is for
+    "max_quality": None,
+}
+DEFAULT_PROFILE = "auto"  # Choose between the profiles above from measured throughput
+
+# For "auto": the link should be several times faster than the stream's bitrate so start-up buffering is short
+AUTO_THRESHOLDS = [  # (minimum measured kbps, profile)
+    (1000, "max_quality"),
+    (400, "balanced"),
+    (0, "data_saver"),
+]
+
+# Higher ranks first when bitrates are close, opus sounds better than aac at the same rate
+CODEC_RANK = {"opus": 2, "mp4a": 1}
+
+MIN_SAMPLE_BYTES = 16 * 1024  # Smaller transfers mostly measure latency, not bandwidth
+EWMA_WEIGHT = 0.3  # Weight of the newest throughput sample
+
+class ThroughputMeter:
+    """Exponentially weighted download throughput from recent transfers"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.kbps = None
+        self.samples = 0
+
+    def record(self, num_bytes, seconds):
+        if num_bytes < MIN_SAMPLE_BYTES or seconds <= 0:
+            return
+        kbps = num_bytes * 8 / 1000 / seconds
+        with self.lock:
+            self.kbps = kbps if self.kbps is None else EWMA_WEIGHT * kbps + (1 - EWMA_WEIGHT) * self.kbps
+            self.samples += 1
+
+    def estimate(self):
+        with self.lock:
+            return self.kbps
+
+_meter = ThroughputMeter()
+
+def get_throughput_meter():
+    return _meter
+
+def selected_profile():
+    """Profile from HIFI_AUDIO_PROFILE, falling back to auto for unknown values"""
+    profile = os.getenv("HIFI_AUDIO_PROFILE", DEFAULT_PROFILE).strip().lower()
+    return profile if profile in PROFILES or profile == "auto" else DEFAULT_PROFILE
+
+def effective_profile():
+    """Profile to use for the next stream resolve"""
+    profile = selected_profile()
+    if profile != "auto":
+        return profile
+    kbps = _meter.estimate()
+    if kbps is None:
+        return "balanced"
+    for minimum, name in AUTO_THRESHOLDS:
+        if kbps >= minimum:
+            return name
+    return "data_saver"
+
+def codec_of(fmt):
+    return (fmt.get("acodec") or "").split(".")[0]
+
+def audio_bitrate(fmt):
+    return fmt.get("abr") or fmt.get("tbr") or 0
+
+def select_audio_format(formats, max_abr=None):
+    """Pick the best audio-only format under the bitrate cap, or the smallest one if none fits"""
+    candidates = [
+        fmt for fmt in formats
+        if fmt.get("url") and fmt.get("vcodec") == "none" and fmt.get("acodec") not in (None, "none")
+        and "drc" not in str(fmt.get("format_id", ""))  # Dynamic range compressed duplicates
+    ]
+    if not candidates:
+        return None
+    # Videos with dubbed audio list every language, keep the original track
+    top_language = max(fmt.get("language_preference") or 0 for fmt in candidates)
+    candidates = [fmt for fmt in candidates if (fmt.get("language_preference") or 0) == top_language]
+    fitting = [fmt for fmt in candidates if max_abr is None or audio_bitrate(fmt) <= max_abr]
+    if not fitting:
+        return min(candidates, key=audio_bitrate)
+    # Round to 16 kbps so a slightly lower opus stream beats a slightly higher aac one
+    return max(fitting, key=lambda fmt: (round(audio_bitrate(fmt) / 16), CODEC_RANK.get(codec_of(fmt), 0), audio_bitrate(fmt)))
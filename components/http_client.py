@@ -0,0 +1,55 @@
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from components.format_policy import get_throughput_meter
+
+# Shared HTTP client so every request reuses keep-alive connections per host
+DEFAULT_TIMEOUT = (5, 15)  # (connect, read) seconds
+POOL_CONNECTIONS = 8  # Number of hosts to keep pools for
+POOL_MAXSIZE = 16  # Connections kept alive per host, enough for concurrent workers
+
+_session = None
+_session_lock = threading.Lock()
+
+def create_session():
+    retry = Retry(
+        total=3,
+        connect=3,
+        read=2,
+        backoff_factor=0.3,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "Accept-Encoding": "gzip, deflate",
+        "User-Agent": "HiFi/1.0 (gzip)",
+    })
+    return session
+
+def get_session():
+    """Return the process-wide requests session"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_session()
+    return _session
+
+def get(url, **kwargs):
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    start = time.perf_counter()
+    response = get_session().get(url, **kwargs)
+    if not kwargs.get("stream"):
+        # Whole-body downloads double as bandwidth samples for the audio format policy
+        get_throughput_meter().record(len(response.content), time.perf_counter() - start)
+    return response
+
+def post(url, **kwargs):
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    return get_session().post(url, **kwargs)
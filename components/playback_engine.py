@@ -0,0 +1,369 @@
+import os
+from PySide6.QtCore import QObject, QThread, QTimer, QUrl, Signal
+from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
+from components.audio_cache import get_audio_cache
+from components.stream_proxy import get_stream_proxy, shutdown_stream_proxy
+from components.playlist import get_audio_info_by_id, get_cached_track_metadata
+from components.playback_supervisor import PlaybackSupervisor
+from components.thumbnail_fetcher import download_first
+from components.thumbnail_variants import screen_ratio, thumbnail_urls
+
+# 0 plays the next track the moment the current one ends, anything above blends them
+CROSSFADE_MS = int(float(os.getenv("HIFI_CROSSFADE_SECONDS", "0")) * 1000)
+FADE_STEP_MS = 50
+UPCOMING_LIMIT = 20  # Tracks remembered after the current one
+THUMBNAIL_SIZE = 100  # Largest the playbar shows the thumbnail, 60 normally and 100 maximized
+
+class AudioLoaderThread(QThread):
+    """Thread to load audio info and thumbnail asynchronously"""
+    metadata_loaded = Signal(dict)  # Cached title/artist, shown while the stream URL resolves
+    data_loaded = Signal(dict)  # Signal to emit loaded data
+    thumbnail_loaded = Signal(str, bytes)  # video_id, image data, after data_loaded so playback never waits on it
+    error_occurred = Signal(str, str)  # video_id, error message
+
+    def __init__(self, video_id, background=False):
+        super().__init__()
+        self.video_id = video_id
+        self.background = background  # Nobody is waiting on it yet, leave the click worker free
+        self.ratio = screen_ratio()
+
+    def run(self):
+        """Run network operations in a separate thread"""
+        try:
+            # A track played before comes straight from disk, no extraction or streaming
+            cached = get_audio_cache().lookup(self.video_id)
+            if cached:
+                self.data_loaded.emit(cached)
+                if not cached["thumbnail_data"]:
+                    self.load_thumbnail(None)
+                return
+
+            metadata = get_cached_track_metadata(self.video_id)
+            if metadata:
+                self.metadata_loaded.emit({**metadata, "video_id": self.video_id})
+
+            # Fetch audio info
+            audio_info = get_audio_info_by_id(self.video_id, background=self.background)
+
+            # Emit loaded data, the thumbnail follows
+            self.data_loaded.emit({
+                "video_id": self.video_id,
+                "audio_url": audio_info["audio_url"],
+                "track_name": audio_info["title"],
+                "artist_name": audio_info["artist"],
+                "thumbnail_data": b"",
+                "codec": audio_info.get("codec"),
+                "itag": audio_info.get("itag"),
+            })
+        except Exception as e:
+            self.error_occurred.emit(self.video_id, str(e))
+            return
+        self.load_thumbnail(audio_info.get("thumbnail"))
+
+    def load_thumbnail(self, fallback_url):
+        """Download a thumbnail sized for the playbar rather than yt-dlp's, which is often maxres
+
+        Fetched on this thread instead of the grids' shared pool, so it never queues behind tiles.
+        """
+        urls = thumbnail_urls(self.video_id, THUMBNAIL_SIZE, THUMBNAIL_SIZE, self.ratio)
+        if fallback_url and fallback_url not in urls:
+            urls.append(fallback_url)
+        try:
+            thumbnail_data = download_first(urls)
+        except Exception as e:
+            print(f"PlaybackEngine: Couldn't load the thumbnail for {self.video_id}: {e}")
+            return
+        get_audio_cache().set_thumbnail(self.video_id, thumbnail_data)
+        self.thumbnail_loaded.emit(self.video_id, thumbnail_data)
+
+class Deck:
+    """One player/output pair; the engine plays on one deck while the other holds the next track"""
+
+    def __init__(self, parent):
+        self.player = QMediaPlayer(parent)
+        self.output = QAudioOutput(parent)
+        self.player.setAudioOutput(self.output)
+        self.track = None  # AudioLoaderThread data for the loaded source
+        self.proxied_id = None  # Track this deck holds in the stream proxy
+
+    def load(self, track):
+        # Released after registering the new track, reloading the same one keeps its buffer
+        previous, self.proxied_id = self.proxied_id, None
+        self.track = track
+        if track.get("audio_path"):
+            url = QUrl.fromLocalFile(track["audio_path"])
+        else:
+            try:
+                # The proxy buffers and caches the stream and re-resolves it if the URL expires
+                url = QUrl(get_stream_proxy().url_for(track))
+                self.proxied_id = track["video_id"]
+                track["via_proxy"] = True
+            except Exception as e:
+                print(f"PlaybackEngine: Stream proxy unavailable, playing directly: {e}")
+                url = QUrl(track["audio_url"])
+        if previous is not None:
+            get_stream_proxy().release(previous)
+        if url == self.player.source():
+            self.player.setSource(QUrl())  # Setting the same source again wouldn't reopen it
+        self.player.setSource(url)
+
+    def clear(self):
+        self.player.stop()
+        self.player.setSource(QUrl())
+        self.track = None
+        self.release_proxy()
+
+    def release_proxy(self):
+        if self.proxied_id is not None:
+            get_stream_proxy().release(self.proxied_id)
+            self.proxied_id = None
+
+class PlaybackEngine(QObject):
+    """Plays tracks on two alternating decks so the next one is resolved and loaded before it's needed"""
+    track_loading = Signal(str)  # video_id whose stream is being resolved
+    metadata_loaded = Signal(dict)  # Cached title/artist for the loading track
+    track_changed = Signal(dict)  # Now playing, AudioLoaderThread's data dict
+    thumbnail_loaded = Signal(str, bytes)  # video_id, image data for the playing track
+    position_changed = Signal(int)  # ms
+    duration_changed = Signal(int)  # ms
+    playing_changed = Signal()  # Read .playing for the new state
+    error_occurred = Signal(str)
+
+    def __init__(self, parent=None, crossfade_ms=CROSSFADE_MS):
+        super().__init__(parent)
+        self.crossfade_ms = crossfade_ms
+        self.volume = 1.0
+        self.decks = [Deck(self), Deck(self)]
+        self.active, self.standby = self.decks
+        for deck in self.decks:
+            deck.player.positionChanged.connect(lambda position, deck=deck: self.on_position_changed(deck, position))
+            deck.player.durationChanged.connect(lambda duration, deck=deck: self.on_duration_changed(deck, duration))
+            deck.player.mediaStatusChanged.connect(lambda status, deck=deck: self.on_media_status_changed(deck, status))
+        self.upcoming = []
+        self.loading_id = None  # Track the user is waiting for
+        self.next_loading_id = None  # Track being prepared on the standby deck
+        self.loaders = []
+        self.playing = False
+        self.fade_timer = QTimer(self)
+        self.fade_timer.timeout.connect(self.fade_step)
+        self.fading_out = None
+        self.fade_elapsed = 0
+        # Recovers stalled, expired or cut-off streams, see supervisor.stats() for its metrics
+        self.supervisor = PlaybackSupervisor(self)
+
+    def current_video_id(self):
+        if self.loading_id:
+            return self.loading_id
+        return self.active.track["video_id"] if self.active.track else None
+
+    def has_track(self):
+        return self.active.track is not None
+
+    def position(self):
+        return self.active.player.position()
+
+    def duration(self):
+        return self.active.player.duration()
+
+    def play(self, video_id, upcoming=()):
+        """Play video_id now and queue upcoming after it"""
+        self.upcoming = [vid for vid in upcoming if vid != video_id][:UPCOMING_LIMIT]
+        if self.current_video_id() == video_id:
+            if not self.playing:
+                self.resume()
+            self.prepare_next()
+            return
+        if self.standby.track and self.standby.track["video_id"] == video_id:
+            self.loading_id = None
+            self.switch_decks()
+            return
+
+        self.finish_fade()
+        self.active.clear()
+        self.set_playing(False)
+        self.loading_id = video_id
+        self.track_loading.emit(video_id)
+        loader = self.start_loader(video_id)
+        loader.metadata_loaded.connect(self.on_current_metadata)
+        loader.data_loaded.connect(self.on_current_loaded)
+        loader.error_occurred.connect(self.on_current_error)
+
+    def start_loader(self, video_id, priority=QThread.InheritPriority, background=False):
+        self.loaders = [loader for loader in self.loaders if loader.isRunning()]
+        loader = AudioLoaderThread(video_id, background)
+        self.loaders.append(loader)
+        loader.thumbnail_loaded.connect(self.on_thumbnail_loaded)
+        loader.start(priority)
+        return loader
+
+    def on_thumbnail_loaded(self, video_id, data):
+        for deck in self.decks:
+            if deck.track and deck.track["video_id"] == video_id:
+                deck.track["thumbnail_data"] = data  # For the audio cache entry and the next track_changed
+        if self.active.track and self.active.track["video_id"] == video_id:
+            self.thumbnail_loaded.emit(video_id, data)
+
+    def on_current_metadata(self, metadata):
+        if metadata["video_id"] == self.loading_id:
+            self.metadata_loaded.emit(metadata)
+
+    def on_current_loaded(self, data):
+        if data["video_id"] != self.loading_id:
+            return  # The user moved on while this was resolving
+        self.loading_id = None
+        self.active.load(data)
+        self.active.output.setVolume(self.volume)
+        self.active.player.play()
+        self.set_playing(True)
+        self.track_changed.emit(data)
+        get_audio_cache().schedule(data)
+        self.prepare_next()
+
+    def on_current_error(self, video_id, error):
+        if video_id == self.loading_id:
+            self.loading_id = None
+            self.error_occurred.emit(error)
+
+    def prepare_next(self):
+        """Resolve and load the first upcoming track on the standby deck"""
+        if not self.upcoming or self.fading_out is not None:
+            return
+        video_id = self.upcoming[0]
+        if video_id in (self.next_loading_id, self.standby.track and self.standby.track["video_id"]):
+            return
+        self.standby.clear()
+        self.next_loading_id = video_id
+        loader = self.start_loader(video_id, QThread.LowPriority, background=True)
+        loader.data_loaded.connect(self.on_next_loaded)
+        loader.error_occurred.connect(self.on_next_error)
+
+    def on_next_loaded(self, data):
+        if data["video_id"] != self.next_loading_id:
+            return
+        self.next_loading_id = None
+        # Setting the source starts opening the stream, so it's buffered by the time it plays
+        self.standby.load(data)
+        self.standby.output.setVolume(0.0 if self.crossfade_ms else self.volume)
+
+    def on_next_error(self, video_id, error):
+        if video_id == self.next_loading_id:
+            print(f"PlaybackEngine: Couldn't prepare {video_id}: {error}")
+            self.next_loading_id = None
+            if self.upcoming and self.upcoming[0] == video_id:
+                self.upcoming.pop(0)
+                self.prepare_next()
+
+    def on_position_changed(self, deck, position):
+        if deck is not self.active:
+            return
+        self.position_changed.emit(position)
+        duration = deck.player.duration()
+        if (self.crossfade_ms and self.fading_out is None and duration > 0 and self.standby.track
+                and duration - position <= self.crossfade_ms):
+            self.switch_decks(fade=True)
+
+    def on_duration_changed(self, deck, duration):
+        if deck is self.active:
+            self.duration_changed.emit(duration)
+
+    def on_media_status_changed(self, deck, status):
+        if deck is not self.active or status != QMediaPlayer.MediaStatus.EndOfMedia:
+            return
+        if self.supervisor.handle_early_end(deck):
+            return
+        if self.standby.track:
+            self.switch_decks()
+        elif self.upcoming:
+            # The next track isn't ready yet, wait for it as if it had been clicked
+            self.next_loading_id = None
+            self.play(self.upcoming[0], self.upcoming[1:])
+        else:
+            self.set_playing(False)
+
+    def switch_decks(self, fade=False):
+        """Start the standby deck's track, fading out or stopping the old one"""
+        self.finish_fade()
+        old, self.active, self.standby = self.active, self.standby, self.active
+        if self.upcoming and self.upcoming[0] == self.active.track["video_id"]:
+            self.upcoming.pop(0)
+        if fade:
+            self.active.output.setVolume(0.0)
+            self.fading_out = old
+            self.fade_elapsed = 0
+            self.fade_timer.start(FADE_STEP_MS)
+        else:
+            old.clear()
+            self.active.output.setVolume(self.volume)
+        self.active.player.play()
+        self.set_playing(True)
+        self.track_changed.emit(self.active.track)
+        get_audio_cache().schedule(self.active.track)
+        duration = self.active.player.duration()
+        if duration > 0:
+            self.duration_changed.emit(duration)
+        if not fade:
+            self.prepare_next()
+
+    def fade_step(self):
+        self.fade_elapsed += FADE_STEP_MS
+        progress = min(1.0, self.fade_elapsed / self.crossfade_ms)
+        self.active.output.setVolume(self.volume * progress)
+        if self.fading_out is not None:
+            self.fading_out.output.setVolume(self.volume * (1.0 - progress))
+        if progress >= 1.0:
+            self.finish_fade()
+            self.prepare_next()
+
+    def finish_fade(self):
+        if self.fading_out is None:
+            return
+        self.fade_timer.stop()
+        self.fading_out.clear()
+        self.fading_out = None
+        self.active.output.setVolume(self.volume)
+
+    def set_playing(self, playing):
+        if playing != self.playing:
+            self.playing = playing
+            self.playing_changed.emit()
+
+    def pause(self):
+        self.active.player.pause()
+        if self.fading_out is not None:
+            self.finish_fade()
+        self.set_playing(False)
+
+    def resume(self):
+        if self.has_track():
+            self.active.player.play()
+            self.set_playing(True)
+
+    def toggle(self):
+        if self.playing:
+            self.pause()
+        else:
+            self.resume()
+
+    def seek(self, position):
+        if self.has_track():
+            self.active.player.setPosition(position)
+
+    def stop(self):
+        """Stop playback and forget the queue"""
+        self.loading_id = None
+        self.next_loading_id = None
+        self.upcoming = []
+        self.finish_fade()
+        for deck in self.decks:
+            deck.clear()
+        self.set_playing(False)
+
+    def shutdown(self):
+        self.stop()
+        self.supervisor.shutdown()
+        get_audio_cache().shutdown()
+        shutdown_stream_proxy()
+        for loader in self.loaders[:]:
+            if loader.isRunning():
+                loader.wait(5000)
+        self.loaders = []
@@ -0,0 +1,184 @@
+import time
+from collections import deque
+from PySide6.QtCore import QObject, QThread, QTimer, Signal
+from PySide6.QtMultimedia import QMediaPlayer
+from components.playlist import get_audio_info_by_id, resolve_audio_info
+from components.stream_cache import get_stream_cache, url_expiry, url_itag
+
+WATCHDOG_MS = 1000
+STALL_SECONDS = 10  # Playing without the position moving this long counts as a stall
+RECOVERY_TIMEOUT = 30  # Seconds a recovery may take before the next stall check retries it
+EARLY_END_MS = 5000  # EndOfMedia this far before the duration means the stream was cut off
+MAX_ATTEMPTS = 3  # Recoveries per track before giving up on it
+RECENT_RECOVERIES = 20  # Recovery times kept for the metrics
+
+class ReresolveThread(QThread):
+    """Get a working stream URL for a track off the UI thread"""
+    resolved = Signal(str, dict)  # video_id, get_audio_info_by_id result
+    failed = Signal(str, str)  # video_id, error message
+
+    def __init__(self, video_id, invalidate, itag=None):
+        super().__init__()
+        self.video_id = video_id
+        self.invalidate = invalidate
+        self.itag = itag  # Format playing now, resuming at a byte offset needs the same one
+
+    def run(self):
+        try:
+            if self.invalidate:
+                get_stream_cache().invalidate_url(self.video_id)
+            if self.invalidate and self.itag:
+                info = resolve_audio_info(self.video_id, itag=self.itag)
+            else:
+                info = get_audio_info_by_id(self.video_id)
+            self.resolved.emit(self.video_id, info)
+        except Exception as e:
+            self.failed.emit(self.video_id, str(e))
+
+class PlaybackSupervisor(QObject):
+    """Watches the playing deck for stalls, errors and cut-off streams and resumes it where it was"""
+
+    def __init__(self, engine):
+        super().__init__(engine)
+        self.engine = engine
+        for deck in engine.decks:
+            deck.player.errorOccurred.connect(lambda error, message, deck=deck: self.on_error(deck, error, message))
+            deck.player.mediaStatusChanged.connect(lambda status, deck=deck: self.on_media_status(deck, status))
+        engine.position_changed.connect(self.on_progress)
+        engine.track_changed.connect(self.on_track_changed)
+        self.watchdog = QTimer(self)
+        self.watchdog.timeout.connect(self.check_stall)
+        self.watchdog.start(WATCHDOG_MS)
+        self.last_progress = time.monotonic()
+        self.last_position = 0
+        self.attempts = 0
+        self.recovering = None  # video_id being recovered
+        self.resume_position = 0
+        self.recovery_started = 0.0
+        self.threads = []
+        self.recoveries = 0
+        self.failures = 0
+        self.recovery_times = deque(maxlen=RECENT_RECOVERIES)
+
+    def stats(self):
+        """Recovery counters and times in ms, e.g. for logging"""
+        times = list(self.recovery_times)
+        return {
+            "recoveries": self.recoveries,
+            "failures": self.failures,
+            "last_ms": times[-1] if times else None,
+            "average_ms": round(sum(times) / len(times)) if times else None,
+        }
+
+    def on_track_changed(self, track):
+        self.attempts = 0
+        self.recovering = None
+        self.last_position = 0
+        self.last_progress = time.monotonic()
+
+    def on_progress(self, position):
+        if position != self.last_position:
+            self.last_position = position
+            self.last_progress = time.monotonic()
+
+    def check_stall(self):
+        if self.recovering and time.perf_counter() - self.recovery_started >= RECOVERY_TIMEOUT:
+            print(f"PlaybackSupervisor: Recovery of {self.recovering} timed out")
+            self.recovering = None
+        if not self.engine.playing or self.recovering or not self.engine.has_track():
+            self.last_progress = time.monotonic()
+            return
+        if time.monotonic() - self.last_progress >= STALL_SECONDS:
+            self.recover("stalled")
+
+    def on_error(self, deck, error, message):
+        if deck is self.engine.active and error != QMediaPlayer.Error.NoError:
+            self.recover(f"error: {message or error}", invalidate=True)
+
+    def on_media_status(self, deck, status):
+        if deck is not self.engine.active:
+            return
+        if status == QMediaPlayer.MediaStatus.InvalidMedia:
+            self.recover("invalid media", invalidate=True)
+        elif self.recovering and status in (QMediaPlayer.MediaStatus.LoadedMedia, QMediaPlayer.MediaStatus.BufferedMedia):
+            self.resume()
+
+    def handle_early_end(self, deck):
+        """Called by the engine on EndOfMedia; True when the stream was cut off and is being recovered"""
+        duration = deck.player.duration()
+        if deck is not self.engine.active or duration <= 0 or deck.player.position() >= duration - EARLY_END_MS:
+            return False
+        return self.recover("ended early")
+
+    def recover(self, reason, invalidate=False):
+        """Re-resolve the playing track in the background, then reload it at the same position"""
+        track = self.engine.active.track
+        if track is None or self.recovering:
+            return bool(self.recovering)
+        video_id = track["video_id"]
+        if self.attempts >= MAX_ATTEMPTS:
+            self.failures += 1
+            print(f"PlaybackSupervisor: Giving up on {video_id} after {self.attempts} recoveries ({reason})")
+            self.engine.error_occurred.emit(f"Playback failed: {reason}")
+            self.attempts = 0
+            self.engine.pause()
+            return False
+        self.attempts += 1
+        self.recovering = video_id
+        self.resume_position = max(self.last_position, self.engine.position())
+        self.recovery_started = time.perf_counter()
+        # A stall on a still-valid URL just needs a reload, the resolver returns the cached one
+        expires = url_expiry(track.get("audio_url"))
+        invalidate = invalidate or (expires is not None and expires <= time.time())
+        print(f"PlaybackSupervisor: {video_id} {reason} at {self.resume_position // 1000}s, recovering")
+        self.threads = [thread for thread in self.threads if thread.isRunning()]
+        itag = track.get("itag") or url_itag(track.get("audio_url"))
+        thread = ReresolveThread(video_id, invalidate, itag)
+        thread.resolved.connect(self.on_resolved)
+        thread.failed.connect(self.on_failed)
+        self.threads.append(thread)
+        thread.start()
+        return True
+
+    def on_resolved(self, video_id, info):
+        deck = self.engine.active
+        if video_id != self.recovering or deck.track is None or deck.track["video_id"] != video_id:
+            return  # The user moved on meanwhile
+        track = {**deck.track, "audio_url": info["audio_url"], "codec": info.get("codec"), "itag": info.get("itag")}
+        for key in ("audio_path", "cached", "via_proxy"):
+            track.pop(key, None)
+        deck.load(track)
+        deck.output.setVolume(self.engine.volume)
+        if deck.player.mediaStatus() in (QMediaPlayer.MediaStatus.LoadedMedia, QMediaPlayer.MediaStatus.BufferedMedia):
+            self.resume()
+
+    def on_failed(self, video_id, error):
+        if video_id != self.recovering:
+            return
+        self.recovering = None
+        self.failures += 1
+        print(f"PlaybackSupervisor: Couldn't re-resolve {video_id}: {error}")
+        self.engine.error_occurred.emit(error)
+        self.engine.pause()
+
+    def resume(self):
+        player = self.engine.active.player
+        player.setPosition(self.resume_position)
+        if self.engine.playing:
+            player.play()
+        elapsed = round((time.perf_counter() - self.recovery_started) * 1000)
+        self.recovery_times.append(elapsed)
+        self.recoveries += 1
+        print(f"PlaybackSupervisor: Resumed {self.recovering} at {self.resume_position // 1000}s after {elapsed} ms")
+        self.recovering = None
+        self.last_progress = time.monotonic()
+
+    def shutdown(self):
+        self.watchdog.stop()
+        self.recovering = None
+        for thread in self.threads:
+            if thread.isRunning():
+                thread.wait(5000)
+        self.threads = []
+        if self.recoveries or self.failures:
+            print(f"PlaybackSupervisor: {self.stats()}")
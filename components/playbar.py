@@ -1,51 +1,17 @@
 from PySide6.QtWidgets import QWidget, QHBoxLayout, QLabel, QPushButton, QSlider, QSizePolicy
-from PySide6.QtCore import Qt, QSize, QPropertyAnimation, QRect, QTimer, QUrl, QThread, Signal
+from PySide6.QtCore import Qt, QSize, QPropertyAnimation, QRect, QTimer
 from PySide6.QtGui import QIcon, QPixmap
-from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
 import math
-import requests
 import os, sys
-from components.playlist import get_audio_info_by_id
+from components.playback_engine import PlaybackEngine
+from components.seek_controller import SeekController
 def resource_path(relative_path):
     """ Get absolute path to resource, works for dev and for PyInstaller """
     if hasattr(sys, '_MEIPASS'):
         return os.path.join(sys._MEIPASS, relative_path)
     return os.path.join(os.path.abspath("."), relative_path)
-class AudioLoaderThread(QThread):
-    """Thread to load audio info and thumbnail asynchronously"""
-    data_loaded = Signal(dict)  # Signal to emit loaded data
-    error_occurred = Signal(str)  # Signal to emit error message
-
-    def __init__(self, video_id):
-        super().__init__()
-        self.video_id = video_id
-
-    def run(self):
-        """Run network operations in a separate thread"""
-        try:
-            # Fetch audio info
-            audio_info = get_audio_info_by_id(self.video_id)
-            audio_url = audio_info["audio_url"]
-            track_name = audio_info["title"]
-            artist_name = audio_info["artist"]
-            thumbnail_url = audio_info["thumbnail"]
-
-            # Fetch thumbnail
-            response = requests.get(thumbnail_url)
-            thumbnail_data = response.content
-
-            # Emit loaded data
-            self.data_loaded.emit({
-                "audio_url": audio_url,
-                "track_name": track_name,
-                "artist_name": artist_name,
-                "thumbnail_data": thumbnail_data
-            })
-        except Exception as e:
-            self.error_occurred.emit(str(e))
-
 class PlayBar(QWidget):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, engine=None):
         super().__init__(parent)
         self.setObjectName("playbar")
         self.is_maximized = False
@@ -53,15 +19,19 @@ class PlayBar(QWidget):
         self.normal_geometry = QRect(0, 0, self.width(), 80)
         self.thumbnail_pixmap = None  # Store thumbnail for background
         
-        # Audio setup
-        self.audio = QMediaPlayer()
-        self.audio_output = QAudioOutput()
-        self.audio.setAudioOutput(self.audio_output)
-        self.current_track_id = None
-        
-        # Timer for time updates
-        self.time_update_timer = QTimer(self)
-        self.time_update_timer.timeout.connect(self.update_time)
+        # Audio setup, the engine outlives this widget when the window passes one in
+        self.engine = engine or PlaybackEngine(self)
+        self.engine_signals = [
+            (self.engine.track_loading, self.on_track_loading),
+            (self.engine.metadata_loaded, self.on_metadata_loaded),
+            (self.engine.track_changed, self.on_audio_data_loaded),
+            (self.engine.thumbnail_loaded, self.on_thumbnail_loaded),
+            (self.engine.error_occurred, self.on_audio_load_error),
+            (self.engine.playing_changed, self.on_playing_changed),
+            (self.engine.duration_changed, self.update_duration),
+        ]
+        for signal, slot in self.engine_signals:
+            signal.connect(slot)
 
         # Timer for background animation
         self.animation_timer = QTimer(self)
@@ -118,10 +88,9 @@ class PlayBar(QWidget):
         self.seek_bar.setValue(0)
         self.seek_bar.setFixedWidth(200)
         self.seek_bar.setCursor(Qt.PointingHandCursor)
-        self.seek_bar.valueChanged.connect(self.seek)
-        self.audio.positionChanged.connect(self.update_position)
-        self.audio.durationChanged.connect(self.update_duration)
         self.main_layout.addWidget(self.seek_bar)
+        # Seeks only on user interaction, and follows playback without turning that into seeks
+        self.seek_controller = SeekController(self.seek_bar, self.engine, self.update_position, self)
 
         # Time label
         self.time_label = QLabel("0:00 / 0:00")
@@ -147,7 +116,7 @@ class PlayBar(QWidget):
         self.close_button.setIconSize(QSize(24, 24))
         self.close_button.setFixedSize(40, 40)
         self.close_button.setCursor(Qt.PointingHandCursor)
-        self.close_button.clicked.connect(self.close_player)
+        self.close_button.clicked.connect(self.dismiss)
         self.main_layout.addWidget(self.close_button)
 
         # Animation setup
@@ -383,47 +352,32 @@ class PlayBar(QWidget):
             self.time_label.setText(f"0:00 / {self.format_time(duration / 1000)}")
 
     def update_position(self, position):
-        """Update seek bar and time label with current position"""
+        """Update seek bar and time label with current position, only the label while dragging"""
+        current_time = position / 1000  # Convert ms to seconds
         if not self.seek_bar.isSliderDown():
-            current_time = position / 1000  # Convert ms to seconds
             self.seek_bar.setValue(int(current_time))
-            duration = self.audio.duration() / 1000 if self.audio.duration() > 0 else 0
-            self.time_label.setText(f"{self.format_time(current_time)} / {self.format_time(duration)}")
+        duration = self.engine.duration() / 1000 if self.engine.duration() > 0 else 0
+        self.time_label.setText(f"{self.format_time(current_time)} / {self.format_time(duration)}")
 
     def toggle_play(self):
         """Toggle between play and pause states"""
-        if not self.audio.source().isValid():
+        if not self.engine.has_track():
             return
-            
-        self.is_playing = not self.is_playing
+        self.engine.toggle()
+
+    def on_playing_changed(self):
+        """Reflect the engine's play state, it also changes on its own when a queued track starts"""
+        self.is_playing = self.engine.playing
         icon = "assets/svgs/pause.svg" if self.is_playing else "assets/svgs/play.svg"
         self.play_button.setIcon(QIcon(resource_path(icon)))
         
         if self.is_playing:
-            self.audio.play()
-            self.time_update_timer.start(1000)  # Update every second
             if not self.is_maximized:
                 self.animation_timer.start(33)  # Start background animation only if not maximized
         else:
-            self.audio.pause()
-            self.time_update_timer.stop()
             self.animation_timer.stop()  # Stop background animation
             self.update_stylesheet(self.is_maximized)  # Reset to static background
 
-    def update_time(self):
-        """Update the time label and seek bar position"""
-        if self.audio.isAvailable() and not self.seek_bar.isSliderDown():
-            current_time = self.audio.position() / 1000  # Convert ms to seconds
-            duration = self.audio.duration() / 1000 if self.audio.duration() > 0 else 0
-            self.seek_bar.setValue(int(current_time))
-            self.time_label.setText(f"{self.format_time(current_time)} / {self.format_time(duration)}")
-
-    def seek(self, value):
-        """Seek to a specific position in the track"""
-        if self.audio.isAvailable():
-            self.audio.setPosition(value * 1000)  # Convert seconds to ms
-            self.update_time()
-
     def toggle_maximize(self):
         """Toggle between normal and full-screen states with animation"""
         self.is_maximized = not self.is_maximized
@@ -448,23 +402,33 @@ class PlayBar(QWidget):
         self.toggle_button.setIcon(QIcon(resource_path(icon)))
         self.animation.start()
 
+    def dismiss(self):
+        """Stop playback and hide the playbar, it's shown again for the next track"""
+        self.engine.stop()
+        if self.is_maximized:
+            self.toggle_maximize()
+        self.track_label.setText("No track playing")
+        self.artist_label.setText("")
+        self.thumbnail_label.clear()
+        self.thumbnail_pixmap = None
+        self.seek_bar.setValue(0)
+        self.time_label.setText("0:00 / 0:00")
+        self.hide()
+
     def close_player(self):
         """Remove the playbar and stop playback"""
         # Stop audio
-        if self.audio:
-            self.audio.stop()
-            self.audio.setSource(QUrl())  # Clear source
-            self.time_update_timer.stop()
-            self.animation_timer.stop()
+        self.engine.stop()
+        self.animation_timer.stop()
         
         # Disconnect any signals to prevent further interactions
         try:
             self.play_button.clicked.disconnect()
             self.toggle_button.clicked.disconnect()
             self.close_button.clicked.disconnect()
-            self.seek_bar.valueChanged.disconnect()
-            self.audio.positionChanged.disconnect()
-            self.audio.durationChanged.disconnect()
+            self.seek_controller.disconnect_all()
+            for signal, slot in self.engine_signals:
+                signal.disconnect(slot)
         except:
             pass  # Ignore if signals are already disconnected
         
@@ -481,68 +445,58 @@ class PlayBar(QWidget):
                 self.setGeometry(parent.geometry())
         super().resizeEvent(event)
 
-    def play_track(self, video_id):
-        """Play a track by its YouTube video ID"""
-        if self.current_track_id == video_id and self.audio:
-            if not self.is_playing:
-                self.toggle_play()
-            return
+    def play_track(self, video_id, upcoming=()):
+        """Play a track by its YouTube video ID, then the upcoming ones"""
+        self.engine.play(video_id, upcoming)
 
-        # Show loading state
+    def on_track_loading(self, video_id):
+        """Show loading state while the engine resolves a track nobody prepared"""
         self.track_label.setText("Loading...")
         self.thumbnail_label.clear()
         self.thumbnail_pixmap = None  # Clear previous thumbnail
+        self.seek_bar.setValue(0)
+        self.time_label.setText("0:00 / 0:00")
+        self.update_stylesheet(self.is_maximized)
 
-        # Stop and clean up existing audio
-        if self.audio:
-            self.audio.stop()
-            self.audio.setSource(QUrl())
-            self.time_update_timer.stop()
-            self.seek_bar.setValue(0)
-            self.time_label.setText("0:00 / 0:00")
-
-        self.current_track_id = video_id
-
-        # Start thread to load audio info and thumbnail
-        self.loader_thread = AudioLoaderThread(video_id)
-        self.loader_thread.data_loaded.connect(self.on_audio_data_loaded)
-        self.loader_thread.error_occurred.connect(self.on_audio_load_error)
-        self.loader_thread.start()
+    def on_metadata_loaded(self, metadata):
+        """Show what we already know about the track while its stream loads"""
+        self.track_label.setText(metadata["title"] or "Loading...")
+        self.artist_label.setText(metadata["artist"] or "")
 
     def on_audio_data_loaded(self, data):
-        """Handle loaded audio data from thread"""
+        """Show the track the engine started playing"""
         try:
             # Update track information
-            self.update_track_info(data["track_name"], data["artist_name"], "0:00")
+            self.track_label.setText(data["track_name"])
+            self.artist_label.setText(data["artist_name"])
 
-            # Load and set thumbnail
-            self.thumbnail_pixmap = QPixmap()
-            self.thumbnail_pixmap.loadFromData(data["thumbnail_data"])
-            thumbnail_size = 100 if self.is_maximized else 60
-            self.thumbnail_label.setPixmap(self.thumbnail_pixmap.scaled(thumbnail_size, thumbnail_size, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-
-            # Update stylesheet to reflect new thumbnail in maximized mode
-            self.update_stylesheet(self.is_maximized)
-
-            # Set and play the audio
-            self.audio.setSource(QUrl(data["audio_url"]))
-            self.audio.play()
-            self.is_playing = True
-            self.play_button.setIcon(QIcon(resource_path("assets/svgs/pause.svg")))
-            self.time_update_timer.start(1000)
-            if not self.is_maximized:
-                self.animation_timer.start(33)  # Start background animation only if not maximized
+            # Load and set thumbnail, it arrives through on_thumbnail_loaded when not known yet
+            self.show_thumbnail(data["thumbnail_data"])
         except Exception as e:
-            self.track_label.setText("Error loading track")
-            self.audio.setSource(QUrl())
             self.thumbnail_label.clear()
             self.thumbnail_pixmap = None
             self.update_stylesheet(self.is_maximized)
 
+    def on_thumbnail_loaded(self, video_id, data):
+        """Show the playing track's thumbnail once it's downloaded"""
+        self.show_thumbnail(data)
+
+    def show_thumbnail(self, data):
+        pixmap = QPixmap()
+        if not data or not pixmap.loadFromData(data):
+            self.thumbnail_label.clear()
+            self.thumbnail_pixmap = None
+        else:
+            self.thumbnail_pixmap = pixmap
+            thumbnail_size = 100 if self.is_maximized else 60
+            self.thumbnail_label.setPixmap(self.thumbnail_pixmap.scaled(thumbnail_size, thumbnail_size, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+
+        # Update stylesheet to reflect new thumbnail in maximized mode
+        self.update_stylesheet(self.is_maximized)
+
     def on_audio_load_error(self, error):
         """Handle errors from audio loading thread"""
         self.track_label.setText("Error loading track")
-        self.audio.setSource(QUrl())
         self.thumbnail_label.clear()
         self.thumbnail_pixmap = None
-        self.update_stylesheet(self.is_maximized)
\ No newline at end of file
+        self.update_stylesheet(self.is_maximized)
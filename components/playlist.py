@@ -1,51 +1,238 @@
-import requests
-import yt_dlp
 from dotenv import load_dotenv
 import os
+import re
+import threading
+from components import http_client
+from components.search_cache import SearchCache, normalize_query
+from components.extraction_service import get_extraction_service
+from components.format_policy import PROFILES, effective_profile
+from components.singleflight import SingleFlight
+from components.stream_cache import get_stream_cache
+from components.track_index import get_track_index
+from components.quota import (
+    PRIORITY_CATEGORY, PRIORITY_INTERACTIVE, QUOTA_ERROR_PREFIX, QuotaExceeded,
+    get_quota_ledger, get_quota_scheduler
+)
 load_dotenv()
 youtube_api_key=os.getenv("YOUTUBE_API_KEY")
-def get_audio_info_by_id(video_id):
-    url = f"https://www.youtube.com/watch?v={video_id}"
-    ydl_opts = {
-        'format': 'bestaudio/best',
-        'quiet': True,
-        'noplaylist': True,
-    }
+YOUTUBE_API_URL = "https://www.googleapis.com/youtube/v3"
+VIDEOS_BATCH_SIZE = 50  # Most ids videos.list accepts in one call
+# Partial-response masks, the API only sends back the fields we actually read
+SEARCH_FIELDS = "nextPageToken,items(id/videoId,snippet(title,channelTitle,thumbnails/high/url))"
+VIDEOS_FIELDS = "items(id,contentDetails/duration,statistics/viewCount)"
+_search_cache = None
+_search_cache_lock = threading.Lock()
+_search_flight = SingleFlight()  # Identical concurrent searches share one API call
+_resolve_flight = SingleFlight()  # A double click shouldn't run yt-dlp twice
+_interactive_resolves = 0
+_interactive_lock = threading.Lock()
+
+def get_search_cache():
+    global _search_cache
+    with _search_cache_lock:
+        if _search_cache is None:
+            _search_cache = SearchCache()
+    return _search_cache
+
+def get_audio_info_by_id(video_id, background=False):
+    """Resolve a video to its audio stream, reusing the cached URL until it's about to expire
+
+    background is for resolves nobody is waiting on yet, e.g. the next queued track.
+    """
+    cached = get_stream_cache().get(video_id)
+    if cached is not None:
+        return cached
+    if background:
+        return _resolve_flight.do(video_id, lambda: resolve_audio_info(video_id, background=True))
+    global _interactive_resolves
+    with _interactive_lock:
+        _interactive_resolves += 1
+    try:
+        return _resolve_flight.do(video_id, lambda: resolve_audio_info(video_id))
+    finally:
+        with _interactive_lock:
+            _interactive_resolves -= 1
 
-    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-        info = ydl.extract_info(url, download=False)
-        result = {
-            "title": info.get("title"),
-            "artist": info.get("uploader"),
-            "thumbnail": info.get("thumbnail"),
-            "audio_url": info.get("url"),
-            "video_url": info.get("webpage_url"),
-        }
+def prefetch_audio_info(video_id):
+    """Resolve a video speculatively into the stream cache; a click on it meanwhile joins this resolve"""
+    if get_stream_cache().get(video_id) is not None:
+        return False
+    _resolve_flight.do(video_id, lambda: resolve_audio_info(video_id, background=True))
+    return True
+
+def interactive_resolve_active():
+    """True while a resolve someone is waiting on is running, speculative work should hold off"""
+    with _interactive_lock:
+        return _interactive_resolves > 0
+
+def resolve_audio_info(video_id, itag=None, background=False):
+    # yt-dlp runs in a worker process, it would otherwise hold the GIL and stall the UI
+    if itag:
+        result = get_extraction_service().extract(video_id, itag=itag)
+        print(f"Format policy: {video_id} -> itag {itag} kept for a stream in progress")
+        get_stream_cache().put(video_id, result)
         return result
+    profile = effective_profile()
+    result = get_extraction_service().extract(video_id, PROFILES[profile], background=background)
+    print(f"Format policy: {video_id} -> itag {result.get('itag')} ({result.get('codec')}, "
+          f"{result.get('abr') or 0:.0f} kbps) with the {profile} profile")
+    get_stream_cache().put(video_id, result)
+    return result
+
+def get_cached_track_metadata(video_id):
+    """Title, artist and thumbnail from an earlier resolve, even if its stream URL has expired"""
+    return get_stream_cache().get_metadata(video_id)
+
+def youtube_api_get(resource, params, priority=PRIORITY_INTERACTIVE, fields=None):
+    """Call a Data API list method, charging its quota cost against today's budget first"""
+    get_quota_scheduler().charge(f"{resource}.list", priority)
+    params = {**params, "key": youtube_api_key}
+    if fields:
+        params["fields"] = fields
+    response = http_client.get(f"{YOUTUBE_API_URL}/{resource}", params=params)
+    data = response.json()
+    if "error" in data:
+        reasons = {error.get("reason") for error in data["error"].get("errors", [])}
+        if reasons & {"quotaExceeded", "dailyLimitExceeded"}:
+            get_quota_ledger().mark_exhausted()
+            raise QuotaExceeded(f"{QUOTA_ERROR_PREFIX} for today is used up, try again after midnight Pacific time")
+        # Don't let an API error be cached as an empty result
+        raise Exception(data["error"].get("message", "YouTube API error"))
+    return data
+
+def search_youtube(query, max_results=5, priority=PRIORITY_INTERACTIVE):
+    """Search YouTube, serving cached results and refreshing stale ones in the background"""
+    return search_youtube_page(query, max_results, None, priority)["results"]
+
+def search_youtube_page(query, max_results=5, page_token=None, priority=PRIORITY_INTERACTIVE):
+    """Fetch one page of search results as {"results": [...], "next_page_token": ...}"""
+    cached, fresh = get_search_cache().get(query, max_results, page_token)
+    if cached is not None:
+        if not fresh:
+            refresh_search_in_background(query, max_results, page_token)
+        return cached
+    return fetch_search_coalesced(query, max_results, page_token, priority)
+
+def fetch_search_coalesced(query, max_results, page_token=None, priority=PRIORITY_INTERACTIVE):
+    """Fetch and cache a search page, sharing the network call with identical in-flight requests"""
+    def fetch_and_store():
+        page = fetch_search_page(query, max_results, page_token, priority)
+        enrich_tracks(page["results"], priority)
+        get_search_cache().put(query, max_results, page, page_token)
+        try:
+            get_track_index().add_tracks(page["results"])
+        except Exception as e:
+            print(f"search_youtube: Failed to index tracks: {e}")
+        return page
+
+    return _search_flight.do((normalize_query(query), max_results, page_token), fetch_and_store)
 
-def search_youtube(query, max_results=5):
-    search_url = "https://www.googleapis.com/youtube/v3/search"
+def refresh_search_in_background(query, max_results, page_token=None):
+    if _search_flight.in_flight((normalize_query(query), max_results, page_token)):
+        return
 
+    def refresh():
+        try:
+            fetch_search_coalesced(query, max_results, page_token, PRIORITY_CATEGORY)
+        except Exception as e:
+            print(f"search_youtube: Background refresh for '{query}' failed: {e}")
+
+    threading.Thread(target=refresh, daemon=True).start()
+
+def fetch_search_page(query, max_results=5, page_token=None, priority=PRIORITY_INTERACTIVE):
     params = {
         "part": "snippet",
         "q": query,
         "type": "video",
         "maxResults": max_results,
-        "key": youtube_api_key,
     }
+    if page_token:
+        params["pageToken"] = page_token
 
-    response = requests.get(search_url, params=params)
+    data = youtube_api_get("search", params, priority, fields=SEARCH_FIELDS)
+    results = [track for track in map(parse_search_item, data.get("items", [])) if track]
+    return {"results": results, "next_page_token": data.get("nextPageToken")}
 
-    data = response.json()
-    results = []
-    for item in data.get("items", []):
-        snippet = item["snippet"]
-        results.append({
-            "name": snippet["channelTitle"],
-            "title": snippet["title"],
-            "thumbnail": snippet["thumbnails"]["high"]["url"],
-            "video_id": item["id"]["videoId"],
-        })
-
-    return results
-    
\ No newline at end of file
+def parse_search_item(item):
+    """Turn one masked search item into a compact track record, None if it has no video id"""
+    video_id = item.get("id", {}).get("videoId")
+    if not video_id:
+        return None
+    snippet = item.get("snippet", {})
+    return {
+        "name": snippet.get("channelTitle", ""),
+        "title": snippet.get("title", ""),
+        "thumbnail": snippet.get("thumbnails", {}).get("high", {}).get("url", ""),
+        "video_id": video_id,
+    }
+
+def parse_duration(value):
+    """Convert an ISO 8601 duration like PT1H2M3S to seconds"""
+    match = re.fullmatch(r"P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?", value or "")
+    if not match:
+        return None
+    days, hours, minutes, seconds = (int(part or 0) for part in match.groups())
+    return ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+
+def enrich_tracks(tracks, priority=PRIORITY_INTERACTIVE):
+    """Attach duration (seconds) and view count to tracks, one videos.list call per 50 tracks"""
+    video_ids = [track["video_id"] for track in tracks if "duration" not in track]
+    details = {}
+    try:
+        for i in range(0, len(video_ids), VIDEOS_BATCH_SIZE):
+            params = {
+                "part": "contentDetails,statistics",
+                "id": ",".join(video_ids[i:i + VIDEOS_BATCH_SIZE]),
+                "maxResults": VIDEOS_BATCH_SIZE,
+            }
+            for item in youtube_api_get("videos", params, priority, fields=VIDEOS_FIELDS).get("items", []):
+                details[item["id"]] = item
+    except Exception as e:
+        # Tracks are still playable without it, the player finds the duration itself
+        print(f"enrich_tracks: Failed to fetch video details: {e}")
+    for track in tracks:
+        item = details.get(track["video_id"])
+        if item:
+            track["duration"] = parse_duration(item.get("contentDetails", {}).get("duration"))
+            views = item.get("statistics", {}).get("viewCount")
+            track["views"] = int(views) if views is not None else None
+    return tracks
+
+class SearchPager:
+    """Walk through search results page by page, the first one can be sized differently from the rest"""
+
+    def __init__(self, query, first_page_size=10, page_size=25, max_pages=5, priority=PRIORITY_CATEGORY):
+        self.query = query
+        self.first_page_size = first_page_size
+        self.page_size = page_size
+        self.max_pages = max_pages  # Every page costs a full search.list call
+        self.priority = priority
+        self.next_page_token = None
+        self.pages_loaded = 0
+        self.exhausted = False
+        self.cancelled = False
+        self.seen_ids = set()
+
+    def has_more(self):
+        return not self.exhausted and not self.cancelled
+
+    def cancel(self):
+        """Stop paging, a request that hasn't been sent yet won't be"""
+        self.cancelled = True
+
+    def next_page(self):
+        if not self.has_more():
+            return []
+        page_size = self.first_page_size if self.pages_loaded == 0 else self.page_size
+        page = search_youtube_page(self.query, page_size, self.next_page_token, self.priority)
+        self.pages_loaded += 1
+        self.next_page_token = page["next_page_token"]
+        self.exhausted = not self.next_page_token or self.pages_loaded >= self.max_pages
+        # Consecutive pages can overlap when results shift between requests
+        results = [track for track in page["results"] if track["video_id"] not in self.seen_ids]
+        self.seen_ids.update(track["video_id"] for track in results)
+        return results
+
+    def __iter__(self):
+        while self.has_more():
+            yield self.next_page()
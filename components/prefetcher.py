@@ -0,0 +1,100 @@
+import threading
+import time
+from collections import deque
+from PySide6.QtCore import QThread
+from components.playlist import interactive_resolve_active, prefetch_audio_info
+
+MAX_PENDING = 6  # Only the most recent visible hints are worth resolving, older ones have scrolled away
+MAX_PER_MINUTE = 12  # Keeps speculative yt-dlp traffic well below what a listener generates
+RECENT_SECONDS = 10 * 60  # Don't try the same video again this soon, whether it worked or not
+INTERACTIVE_BACKOFF = 0.5  # Seconds to wait while a click's resolve is running
+
+class StreamPrefetcher(QThread):
+    """Resolve stream URLs for tiles the user is likely to click, one at a time, in the background
+
+    Hovered tiles jump the queue and visible tiles wait behind them. The queue is
+    short and can be dropped at any time, and nothing runs while an interactive
+    resolve is in progress.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pending = deque()
+        self.urgent = set()  # Hovered ids in pending, they're never trimmed
+        self.condition = threading.Condition()
+        self.recent = {}  # video_id -> time it was last attempted
+        self.started_at = deque()  # Start times of resolves within the last minute
+        self.stopping = False
+
+    def hint_hovered(self, video_id):
+        self.enqueue(video_id, urgent=True)
+
+    def hint_visible(self, video_ids):
+        for video_id in video_ids:
+            self.enqueue(video_id)
+
+    def enqueue(self, video_id, urgent=False):
+        if not video_id or time.monotonic() - self.recent.get(video_id, -RECENT_SECONDS) < RECENT_SECONDS:
+            return
+        with self.condition:
+            if video_id in self.pending:
+                if not urgent:
+                    return
+                self.pending.remove(video_id)
+            if urgent:
+                self.pending.appendleft(video_id)
+                self.urgent.add(video_id)
+            else:
+                self.pending.append(video_id)
+            while len(self.pending) > MAX_PENDING:
+                # Visible hints are appended, so the first non-urgent one is the oldest
+                oldest = next((vid for vid in self.pending if vid not in self.urgent), None)
+                if oldest is None:
+                    break
+                self.pending.remove(oldest)
+            self.condition.notify()
+
+    def cancel_pending(self):
+        """Forget queued hints, e.g. when the user switches pages; a resolve already running finishes"""
+        with self.condition:
+            self.pending.clear()
+            self.urgent.clear()
+
+    def stop(self):
+        with self.condition:
+            self.stopping = True
+            self.pending.clear()
+            self.urgent.clear()
+            self.condition.notify()
+
+    def next_video_id(self):
+        with self.condition:
+            while not self.stopping:
+                if self.pending and not interactive_resolve_active():
+                    now = time.monotonic()
+                    while self.started_at and now - self.started_at[0] > 60:
+                        self.started_at.popleft()
+                    if len(self.started_at) < MAX_PER_MINUTE:
+                        self.started_at.append(now)
+                        video_id = self.pending.popleft()
+                        self.urgent.discard(video_id)
+                        return video_id
+                    self.condition.wait(60 - (now - self.started_at[0]))
+                elif self.pending:
+                    self.condition.wait(INTERACTIVE_BACKOFF)
+                else:
+                    self.condition.wait()
+            return None
+
+    def run(self):
+        while True:
+            video_id = self.next_video_id()
+            if video_id is None:
+                return
+            self.recent[video_id] = time.monotonic()
+            try:
+                start = time.perf_counter()
+                if prefetch_audio_info(video_id):
+                    print(f"StreamPrefetcher: Resolved {video_id} in {time.perf_counter() - start:.1f}s")
+            except Exception as e:
+                print(f"StreamPrefetcher: Failed to resolve {video_id}: {e}")
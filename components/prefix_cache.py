@@ -0,0 +1,35 @@
+from collections import OrderedDict
+from components.search_cache import normalize_query
+
+class PrefixCache:
+    """Recent search results by query, so a refined query can show matches before its own search returns"""
+
+    def __init__(self, max_entries=100):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+
+    def put(self, query, track_info):
+        key = normalize_query(query)
+        self.entries[key] = list(track_info)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def lookup(self, query):
+        """Return (track_info, is_exact) for the query or its longest cached prefix, or (None, False)"""
+        key = normalize_query(query)
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return self.entries[key], True
+        best = None
+        for cached_query in self.entries:
+            if key.startswith(cached_query) and (best is None or len(cached_query) > len(best)):
+                best = cached_query
+        if best is None:
+            return None, False
+        words = key.split()
+        matches = [
+            tr for tr in self.entries[best]
+            if all(word in f"{tr['name']} {tr['artists']}".lower() for word in words)
+        ]
+        return matches, False
@@ -0,0 +1,139 @@
+import datetime
+import os
+import sqlite3
+import threading
+from components.appdata import app_data_dir
+
+# YouTube Data API v3 cost in quota units per call
+API_COSTS = {
+    "search.list": 100,
+    "videos.list": 1,
+}
+DEFAULT_DAILY_LIMIT = 10000  # Units Google grants a new API key
+
+# Request priorities, lowest number wins when the budget is tight
+PRIORITY_INTERACTIVE = 0  # The user typed or clicked something and is waiting
+PRIORITY_CATEGORY = 1  # Category pages and background refreshes of cached categories
+PRIORITY_PREFETCH = 2  # Speculative work nobody asked for yet
+
+# Share of the daily budget that has to be left after a call for each priority to go ahead
+RESERVES = {
+    PRIORITY_INTERACTIVE: 0.0,
+    PRIORITY_CATEGORY: 0.15,
+    PRIORITY_PREFETCH: 0.40,
+}
+
+QUOTA_ERROR_PREFIX = "YouTube quota"
+
+class QuotaExceeded(Exception):
+    pass
+
+def is_quota_error(message):
+    return str(message).startswith(QUOTA_ERROR_PREFIX)
+
+def _pacific_tz():
+    try:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo("America/Los_Angeles")
+    except Exception:
+        return datetime.timezone(datetime.timedelta(hours=-8))
+
+def daily_limit():
+    """YOUTUBE_QUOTA_LIMIT, read on use so a value from .env is seen whenever dotenv gets loaded"""
+    return int(os.getenv("YOUTUBE_QUOTA_LIMIT", str(DEFAULT_DAILY_LIMIT)))
+
+def quota_day():
+    """The Data API quota resets at midnight Pacific time"""
+    return datetime.datetime.now(_pacific_tz()).date().isoformat()
+
+class QuotaLedger:
+    """Persistent per-day record of Data API units spent"""
+
+    def __init__(self, path=None, limit=None):
+        self.path = path or os.path.join(app_data_dir(), "quota.db")
+        self.daily_limit = limit if limit is not None else daily_limit()
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS usage (
+                day TEXT NOT NULL,
+                method TEXT NOT NULL,
+                calls INTEGER NOT NULL,
+                units INTEGER NOT NULL,
+                PRIMARY KEY (day, method)
+            );
+            CREATE TABLE IF NOT EXISTS exhausted (
+                day TEXT PRIMARY KEY
+            );
+        """)
+        self.conn.commit()
+
+    def record(self, method, units=None):
+        units = API_COSTS.get(method, 1) if units is None else units
+        with self.lock:
+            self.conn.execute("""
+                INSERT INTO usage (day, method, calls, units) VALUES (?, ?, 1, ?)
+                ON CONFLICT (day, method) DO UPDATE SET calls = calls + 1, units = units + excluded.units
+            """, (quota_day(), method, units))
+            self.conn.commit()
+
+    def mark_exhausted(self):
+        """The API said the key is out of quota, trust it over our own count for the rest of the day"""
+        with self.lock:
+            self.conn.execute("INSERT OR IGNORE INTO exhausted (day) VALUES (?)", (quota_day(),))
+            self.conn.commit()
+
+    def used(self):
+        with self.lock:
+            row = self.conn.execute("SELECT COALESCE(SUM(units), 0) FROM usage WHERE day = ?", (quota_day(),)).fetchone()
+        return row[0]
+
+    def remaining(self):
+        with self.lock:
+            if self.conn.execute("SELECT 1 FROM exhausted WHERE day = ?", (quota_day(),)).fetchone():
+                return 0
+            return max(0, self.daily_limit - self.used())
+
+    def usage_by_method(self):
+        with self.lock:
+            rows = self.conn.execute("SELECT method, calls, units FROM usage WHERE day = ?", (quota_day(),)).fetchall()
+        return {method: {"calls": calls, "units": units} for method, calls, units in rows}
+
+class QuotaScheduler:
+    """Decide whether a Data API call may run given its priority and the budget left today"""
+
+    def __init__(self, ledger):
+        self.ledger = ledger
+
+    def allows(self, method, priority):
+        reserve = RESERVES.get(priority, RESERVES[PRIORITY_PREFETCH]) * self.ledger.daily_limit
+        return self.ledger.remaining() - API_COSTS.get(method, 1) >= reserve
+
+    def charge(self, method, priority=PRIORITY_INTERACTIVE):
+        """Record the call's cost up front or raise QuotaExceeded if its priority can't afford it"""
+        with self.ledger.lock:
+            if not self.allows(method, priority):
+                remaining = self.ledger.remaining()
+                if remaining < API_COSTS.get(method, 1):
+                    raise QuotaExceeded(f"{QUOTA_ERROR_PREFIX} for today is used up, try again after midnight Pacific time")
+                raise QuotaExceeded(f"{QUOTA_ERROR_PREFIX} is low ({remaining} units left), saving it for searches")
+            self.ledger.record(method)
+
+_ledger = None
+_scheduler = None
+_lock = threading.Lock()
+
+def get_quota_ledger():
+    global _ledger
+    with _lock:
+        if _ledger is None:
+            _ledger = QuotaLedger()
+    return _ledger
+
+def get_quota_scheduler():
+    global _scheduler
+    ledger = get_quota_ledger()
+    with _lock:
+        if _scheduler is None:
+            _scheduler = QuotaScheduler(ledger)
+    return _scheduler
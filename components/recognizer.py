@@ -4,10 +4,10 @@ import hmac
 import os
 import time
 import tempfile
-import requests
 import sounddevice as sd
 from scipy.io.wavfile import write
 from dotenv import load_dotenv
+from components import http_client
 load_dotenv()
 
 # === ACRCloud credentials ===
@@ -69,7 +69,7 @@ class AudioRecognizer:
                 'data_type': data_type,
                 "signature_version": signature_version
             }
-            response = requests.post(ACR_REQURL, files=files, data=data)
+            response = http_client.post(ACR_REQURL, files=files, data=data)
             response.encoding = "utf-8"
             self.result = response.json()
 
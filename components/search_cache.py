@@ -0,0 +1,84 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from components.appdata import app_data_dir
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+# How long a search result is considered fresh, per category query
+CATEGORY_TTLS = {
+    "coke studio": 6 * HOUR,
+    "weekly top songs": 6 * HOUR,
+    "mood songs": 12 * HOUR,
+    "new music releases": 3 * HOUR,
+    "top playlists": DAY,
+    "pop music": DAY,
+    "rock music": DAY,
+    "popular song of all time": 7 * DAY,
+}
+DEFAULT_TTL = HOUR  # Free-text searches
+MAX_STALE = 7 * DAY  # Past this, a stale entry is not worth showing at all
+SCHEMA_VERSION = 2  # Bump when the table layout changes, old caches are simply dropped
+
+def normalize_query(query):
+    """Lowercase and collapse whitespace so equivalent queries share a cache key"""
+    return " ".join(query.lower().split())
+
+def ttl_for(query):
+    return CATEGORY_TTLS.get(normalize_query(query), DEFAULT_TTL)
+
+class SearchCache:
+    """SQLite-backed cache of search result pages keyed by (normalized query, max_results, page token)"""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(app_data_dir(), "search_cache.db")
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self.conn.execute("DROP TABLE IF EXISTS searches")
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS searches (
+                query TEXT NOT NULL,
+                max_results INTEGER NOT NULL,
+                page_token TEXT NOT NULL,
+                results TEXT NOT NULL,
+                next_page_token TEXT,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (query, max_results, page_token)
+            )
+        """)
+        self.conn.commit()
+
+    def get(self, query, max_results, page_token=None):
+        """Return (page, is_fresh); page is None on a miss or when too stale to use"""
+        key = normalize_query(query)
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT results, next_page_token, fetched_at FROM searches WHERE query = ? AND max_results = ? AND page_token = ?",
+                (key, max_results, page_token or "")
+            ).fetchone()
+        if row is None:
+            return None, False
+        results, next_page_token, fetched_at = row
+        age = time.time() - fetched_at
+        ttl = ttl_for(key)
+        if age > ttl + MAX_STALE:
+            return None, False
+        return {"results": json.loads(results), "next_page_token": next_page_token}, age <= ttl
+
+    def put(self, query, max_results, page, page_token=None):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO searches (query, max_results, page_token, results, next_page_token, fetched_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (normalize_query(query), max_results, page_token or "", json.dumps(page["results"]), page.get("next_page_token"), time.time())
+            )
+            self.conn.commit()
+
+    def clear(self):
+        with self.lock:
+            self.conn.execute("DELETE FROM searches")
+            self.conn.commit()
@@ -0,0 +1,81 @@
+import time
+from PySide6.QtCore import QObject, QTimer
+from PySide6.QtWidgets import QAbstractSlider
+
+UI_INTERVAL_MS = 250  # Most often the seek bar and time label follow playback
+COALESCE_MS = 200  # Groove clicks and arrow keys within this window become one seek
+SEEK_TOLERANCE_MS = 500  # Closer than this to where playback already is isn't worth a seek
+
+class SeekController(QObject):
+    """Seek only when the user moves the seek bar, and follow playback on it at a throttled rate
+
+    Programmatic seek bar updates never turn into seeks, a drag becomes a single
+    seek on release, and bursts of clicks or key presses are coalesced.
+    """
+
+    def __init__(self, slider, engine, show_position, parent=None):
+        super().__init__(parent)
+        self.slider = slider
+        self.engine = engine
+        self.show_position = show_position  # Called with a position in ms to update the UI
+        self.latest_position = 0
+        self.last_ui_update = 0.0
+        self.seeks = 0
+        self.pending_seek = QTimer(self)
+        self.pending_seek.setSingleShot(True)
+        self.pending_seek.timeout.connect(self.commit)
+        self.trailing_update = QTimer(self)
+        self.trailing_update.setSingleShot(True)
+        self.trailing_update.timeout.connect(self.apply_position)
+
+        slider.sliderMoved.connect(self.on_slider_moved)
+        slider.sliderReleased.connect(self.commit)
+        slider.actionTriggered.connect(self.on_slider_action)
+        engine.position_changed.connect(self.on_engine_position)
+
+    def on_slider_moved(self, value):
+        # Preview where the drag would land, the seek itself waits for the release
+        self.show_position(value * 1000)
+
+    def on_slider_action(self, action):
+        if action in (QAbstractSlider.SliderNoAction, QAbstractSlider.SliderMove):
+            return  # Drags are handled by moved/released
+        self.pending_seek.start(COALESCE_MS)
+
+    def commit(self):
+        self.pending_seek.stop()
+        if not self.engine.has_track():
+            return
+        target = self.slider.value() * 1000
+        if abs(target - self.engine.position()) >= SEEK_TOLERANCE_MS:
+            self.engine.seek(target)
+            self.seeks += 1
+        self.latest_position = target
+        self.apply_position()
+
+    def on_engine_position(self, position):
+        self.latest_position = position
+        if self.slider.isSliderDown() or self.pending_seek.isActive():
+            return
+        wait_ms = UI_INTERVAL_MS - (time.monotonic() - self.last_ui_update) * 1000
+        if wait_ms <= 0:
+            self.apply_position()
+        elif not self.trailing_update.isActive():
+            self.trailing_update.start(int(wait_ms))
+
+    def apply_position(self):
+        self.trailing_update.stop()
+        self.last_ui_update = time.monotonic()
+        self.show_position(self.latest_position)
+
+    def disconnect_all(self):
+        for signal, slot in [
+            (self.slider.sliderMoved, self.on_slider_moved),
+            (self.slider.sliderReleased, self.commit),
+            (self.slider.actionTriggered, self.on_slider_action),
+            (self.engine.position_changed, self.on_engine_position),
+        ]:
+            try:
+                signal.disconnect(slot)
+            except (RuntimeError, TypeError):
+                pass
@@ -0,0 +1,113 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse, parse_qs
+from components.appdata import app_data_dir
+
+EXPIRY_MARGIN = 5 * 60  # Treat a URL as expired a bit early so playback doesn't start on a dying link
+DEFAULT_URL_TTL = 60 * 60  # For URLs that don't say when they expire
+
+def url_expiry(audio_url):
+    """Read the expire timestamp googlevideo puts in stream URLs, as a query parameter or a path segment"""
+    parsed = urlparse(audio_url or "")
+    expire = parse_qs(parsed.query).get("expire")
+    if expire and expire[0].isdigit():
+        return int(expire[0])
+    match = re.search(r"/expire/(\d+)", parsed.path)
+    if match:
+        return int(match.group(1))
+    return None
+
+def url_itag(audio_url):
+    """The format (itag) a googlevideo stream URL serves, or None"""
+    parsed = urlparse(audio_url or "")
+    itag = parse_qs(parsed.query).get("itag")
+    if itag:
+        return itag[0]
+    match = re.search(r"/itag/(\d+)", parsed.path)
+    return match.group(1) if match else None
+
+class StreamCache:
+    """Resolved stream info by video id; metadata is kept for good, the short-lived audio URL separately"""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(app_data_dir(), "streams.db")
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS metadata (
+                video_id TEXT PRIMARY KEY,
+                title TEXT,
+                artist TEXT,
+                thumbnail TEXT,
+                video_url TEXT,
+                fetched_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS stream_urls (
+                video_id TEXT PRIMARY KEY,
+                audio_url TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            );
+        """)
+        self.conn.commit()
+
+    def get(self, video_id):
+        """Return the full get_audio_info_by_id dict, or None if the metadata or a live URL is missing"""
+        metadata = self.get_metadata(video_id)
+        if metadata is None:
+            return None
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT audio_url, expires_at FROM stream_urls WHERE video_id = ?", (video_id,)
+            ).fetchone()
+        if row is None or row[1] - EXPIRY_MARGIN <= time.time():
+            return None
+        return {**metadata, "audio_url": row[0]}
+
+    def get_metadata(self, video_id):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT title, artist, thumbnail, video_url FROM metadata WHERE video_id = ?", (video_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        title, artist, thumbnail, video_url = row
+        return {"title": title, "artist": artist, "thumbnail": thumbnail, "video_url": video_url}
+
+    def put(self, video_id, info):
+        now = time.time()
+        expires_at = url_expiry(info.get("audio_url")) or now + DEFAULT_URL_TTL
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO metadata (video_id, title, artist, thumbnail, video_url, fetched_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (video_id, info.get("title"), info.get("artist"), info.get("thumbnail"), info.get("video_url"), now)
+            )
+            if info.get("audio_url"):
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO stream_urls (video_id, audio_url, expires_at) VALUES (?, ?, ?)",
+                    (video_id, info["audio_url"], expires_at)
+                )
+            self.conn.commit()
+
+    def invalidate_url(self, video_id):
+        """Forget the audio URL (e.g. the server started refusing it) but keep the metadata"""
+        with self.lock:
+            self.conn.execute("DELETE FROM stream_urls WHERE video_id = ?", (video_id,))
+            self.conn.commit()
+
+    def purge_expired(self):
+        with self.lock:
+            self.conn.execute("DELETE FROM stream_urls WHERE expires_at <= ?", (time.time(),))
+            self.conn.commit()
+
+_stream_cache = None
+_stream_cache_lock = threading.Lock()
+
+def get_stream_cache():
+    global _stream_cache
+    with _stream_cache_lock:
+        if _stream_cache is None:
+            _stream_cache = StreamCache()
+    return _stream_cache
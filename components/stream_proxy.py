@@ -0,0 +1,299 @@
+import itertools
+import re
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from components import http_client
+from components.stream_cache import url_itag
+
+CHUNK_SIZE = 512 * 1024  # Unit of upstream fetches and of the in-memory buffer
+READ_AHEAD = 4  # Chunks fetched past the one being served, about 30s of 128 kbps audio
+FETCH_WORKERS = 3
+FETCH_TIMEOUT = 20  # Seconds a request waits for a chunk before giving up on the connection
+MAX_TRACKS = 3  # Tracks kept buffered: the current one, the queued one and the one before
+# Tracks a deck is playing or holding ready are never evicted, so this can be exceeded briefly
+MIME_TYPES = {"opus": "audio/webm", "mp4a": "audio/mp4"}
+
+class UpstreamExpired(Exception):
+    pass
+
+class UpstreamChanged(Exception):
+    """The upstream file is no longer the one already served, byte offsets don't line up"""
+
+class BufferedTrack:
+    """Chunks of one track's upstream stream, fetched on demand and kept for instant re-reads"""
+
+    def __init__(self, proxy, track):
+        self.proxy = proxy
+        self.video_id = track["video_id"]
+        self.track = track
+        self.upstream_url = track["audio_url"]
+        self.itag = track.get("itag") or url_itag(self.upstream_url)
+        self.generation = next(proxy.generations)  # In the local URL, so a replaced buffer gets a new one
+        self.size = None
+        self.chunks = {}
+        self.fetching = {}  # chunk index -> Event set when the fetch ends
+        self.lock = threading.Lock()
+        self.resolve_lock = threading.Lock()
+        self.teed = False
+
+    def chunk_count(self):
+        return (self.size + CHUNK_SIZE - 1) // CHUNK_SIZE
+
+    def get_chunk(self, index):
+        """Return chunk bytes, fetching them if needed, and keep the next few coming"""
+        self.ensure_chunk(index)
+        self.read_ahead(index + 1)
+        with self.lock:
+            chunk = self.chunks.get(index)
+        if chunk is None:
+            raise IOError(f"Chunk {index} of {self.video_id} failed to download")
+        return chunk
+
+    def ensure_chunk(self, index):
+        with self.lock:
+            if index in self.chunks:
+                return
+            event = self.fetching.get(index)
+            leader = event is None
+            if leader:
+                event = self.fetching[index] = threading.Event()
+        if not leader:
+            # Someone (usually read-ahead) is already fetching it
+            if not event.wait(FETCH_TIMEOUT):
+                raise TimeoutError(f"Chunk {index} of {self.video_id} took too long")
+            return
+        try:
+            self.fetch(index)
+        finally:
+            with self.lock:
+                del self.fetching[index]
+            event.set()
+
+    def read_ahead(self, first):
+        if self.size is None:
+            return
+        for index in range(first, min(first + READ_AHEAD, self.chunk_count())):
+            with self.lock:
+                if index in self.chunks or index in self.fetching:
+                    continue
+            self.proxy.executor.submit(self.prefetch, index)
+
+    def prefetch(self, index):
+        try:
+            self.ensure_chunk(index)
+        except Exception as e:
+            print(f"StreamProxy: Read-ahead of {self.video_id} chunk {index} failed: {e}")
+
+    def fetch(self, index):
+        start = index * CHUNK_SIZE
+        url = self.upstream_url
+        try:
+            data = self.fetch_range(url, start)
+        except UpstreamExpired:
+            # Signed URLs expire mid-listen, get a fresh one and carry on from the same byte
+            self.reresolve(url)
+            data = self.fetch_range(self.upstream_url, start)
+        with self.lock:
+            self.chunks[index] = data
+            complete = self.size is not None and len(self.chunks) == self.chunk_count()
+        if complete and not self.teed:
+            self.teed = True
+            self.proxy.tee(self)
+
+    def fetch_range(self, url, start):
+        # http_client.get records the download as a throughput sample for the format policy
+        response = http_client.get(url, headers={"Range": f"bytes={start}-{start + CHUNK_SIZE - 1}"})
+        if response.status_code in (403, 410):
+            raise UpstreamExpired(f"Upstream answered {response.status_code}")
+        response.raise_for_status()
+        total = response.headers.get("Content-Range", "").rpartition("/")[2]
+        size = int(total) if total.isdigit() else len(response.content)
+        with self.lock:
+            changed = self.size is not None and size != self.size
+            if not changed:
+                self.size = size
+        if changed:
+            # Serving the new file from where the player is in the old one would corrupt the stream,
+            # fail instead so the playback supervisor reloads the track and seeks back
+            print(f"StreamProxy: {self.video_id} changed size upstream, dropping its buffer")
+            self.proxy.drop(self)
+            raise UpstreamChanged(f"{self.video_id} changed from {self.size} to {size} bytes upstream")
+        return response.content
+
+    def reresolve(self, expired_url):
+        from components.playlist import get_audio_info_by_id, resolve_audio_info
+        from components.stream_cache import get_stream_cache
+        with self.resolve_lock:
+            if self.upstream_url != expired_url:
+                return  # Another read already replaced it
+            print(f"StreamProxy: Upstream URL for {self.video_id} expired, re-resolving")
+            get_stream_cache().invalidate_url(self.video_id)
+            # Same format as before, another one (the auto profile may have moved) has other byte offsets
+            if self.itag:
+                info = resolve_audio_info(self.video_id, itag=self.itag)
+            else:
+                info = get_audio_info_by_id(self.video_id)
+            self.upstream_url = info["audio_url"]
+            self.track["audio_url"] = self.upstream_url
+
+    def assemble(self):
+        with self.lock:
+            return b"".join(self.chunks[index] for index in range(self.chunk_count()))
+
+class ProxyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, the player issues a new range request on every seek
+
+    def do_HEAD(self):
+        self.respond(send_body=False)
+
+    def do_GET(self):
+        self.respond(send_body=True)
+
+    def respond(self, send_body):
+        match = re.fullmatch(r"/audio/([\w-]+)/(\d+)", self.path)
+        buffered = self.server.proxy.tracks.get(match.group(1)) if match else None
+        if buffered is None or buffered.generation != int(match.group(2)):
+            # Requests for a dropped or replaced buffer would get another file's bytes
+            self.send_error(404)
+            return
+        try:
+            if buffered.size is None:
+                buffered.get_chunk(0)  # Learn the size
+            first, last, partial = self.parse_range(buffered.size)
+        except Exception as e:
+            print(f"StreamProxy: Can't serve {buffered.video_id}: {e}")
+            self.send_error(502)
+            return
+        if first is None:
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{buffered.size}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(206 if partial else 200)
+        self.send_header("Content-Type", MIME_TYPES.get(buffered.track.get("codec"), "application/octet-stream"))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(last - first + 1))
+        if partial:
+            self.send_header("Content-Range", f"bytes {first}-{last}/{buffered.size}")
+        self.end_headers()
+        if not send_body:
+            return
+        position = first
+        try:
+            while position <= last:
+                index = position // CHUNK_SIZE
+                chunk = buffered.get_chunk(index)
+                offset = position - index * CHUNK_SIZE
+                data = chunk[offset:offset + last - position + 1]
+                self.wfile.write(data)
+                position += len(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The player seeked away and dropped this request
+        except Exception as e:
+            print(f"StreamProxy: Stream of {buffered.video_id} broke at byte {position}: {e}")
+            self.close_connection = True
+
+    def parse_range(self, size):
+        """Return (first, last, is_partial); first is None when the range can't be satisfied"""
+        match = re.fullmatch(r"bytes=(\d*)-(\d*)", self.headers.get("Range", "").strip())
+        if not match or not (match.group(1) or match.group(2)):
+            return 0, size - 1, False
+        if match.group(1):
+            first = int(match.group(1))
+            last = min(int(match.group(2)), size - 1) if match.group(2) else size - 1
+        else:  # Suffix range, the last N bytes
+            first = max(0, size - int(match.group(2)))
+            last = size - 1
+        if first > last or first >= size:
+            return None, None, True
+        return first, last, True
+
+    def log_message(self, format, *args):
+        pass
+
+class StreamProxy:
+    """Localhost HTTP server QMediaPlayer streams from, so buffering, retries and caching are ours"""
+
+    def __init__(self):
+        self.tracks = OrderedDict()
+        self.holders = Counter()  # video_id -> decks that have it loaded
+        self.generations = itertools.count(1)
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="stream-proxy")
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), ProxyHandler)
+        self.server.daemon_threads = True
+        self.server.proxy = self
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def url_for(self, track):
+        """Register a resolved track and return the local URL to play it from
+
+        The caller holds the track until it calls release(), held tracks aren't evicted.
+        """
+        video_id = track["video_id"]
+        with self.lock:
+            buffered = self.tracks.get(video_id)
+            itag = track.get("itag") or url_itag(track["audio_url"])
+            if buffered is None or (itag and buffered.itag and itag != buffered.itag):
+                # A different format is a different file, its bytes can't share a buffer
+                buffered = self.tracks[video_id] = BufferedTrack(self, track)
+            elif buffered.upstream_url != track["audio_url"]:
+                buffered.upstream_url = track["audio_url"]
+            self.tracks.move_to_end(video_id)
+            self.holders[video_id] += 1
+            self.evict()
+        return f"http://127.0.0.1:{self.server.server_port}/audio/{video_id}/{buffered.generation}"
+
+    def release(self, video_id):
+        with self.lock:
+            self.holders[video_id] -= 1
+            if self.holders[video_id] <= 0:
+                del self.holders[video_id]
+            self.evict()
+
+    def evict(self):
+        """Drop the least recently registered tracks nobody holds, past MAX_TRACKS"""
+        for video_id in list(self.tracks):
+            if len(self.tracks) <= MAX_TRACKS:
+                break
+            if not self.holders[video_id]:
+                del self.tracks[video_id]
+
+    def drop(self, buffered):
+        """Forget a buffer so the next url_for() for its track starts afresh"""
+        with self.lock:
+            if self.tracks.get(buffered.video_id) is buffered:
+                del self.tracks[buffered.video_id]
+
+    def tee(self, buffered):
+        """Hand a fully buffered track to the disk cache"""
+        from components.audio_cache import get_audio_cache
+        try:
+            get_audio_cache().store(buffered.track, buffered.assemble())
+        except Exception as e:
+            print(f"StreamProxy: Couldn't cache {buffered.video_id}: {e}")
+
+    def shutdown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+_proxy = None
+_proxy_lock = threading.Lock()
+
+def get_stream_proxy():
+    global _proxy
+    with _proxy_lock:
+        if _proxy is None:
+            _proxy = StreamProxy()
+    return _proxy
+
+def shutdown_stream_proxy():
+    with _proxy_lock:
+        if _proxy is not None:
+            _proxy.shutdown()
@@ -0,0 +1,128 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from PySide6.QtGui import QPixmap
+from components.appdata import app_data_dir
+
+MB = 1024 * 1024
+MEMORY_BUDGET = 32 * MB  # Decoded pixmaps, a 140x150 tile is about 82 KB
+DISK_BUDGET = int(os.getenv("HIFI_THUMBNAIL_CACHE_MB", "50")) * MB
+PRUNE_TARGET = 0.9  # Prune to this share of the disk budget so it isn't rescanned on every save
+
+def pixmap_bytes(pixmap):
+    return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+class ThumbnailCache:
+    """Finished thumbnails by video id and size: decoded pixmaps in memory, PNG files on disk
+
+    Only processed images are stored (scaled, rounded), so a hit needs no network
+    and, from memory, no decoding either.
+    """
+
+    def __init__(self, directory=None, memory_budget=MEMORY_BUDGET, disk_budget=DISK_BUDGET):
+        self.directory = directory or app_data_dir("thumbnails")
+        self.memory_budget = memory_budget
+        self.disk_budget = disk_budget
+        self.lock = threading.Lock()
+        self.pixmaps = OrderedDict()  # (video_id, width, height) -> QPixmap, least recently used first
+        self.memory_bytes = 0
+        self.disk_bytes = 0  # Set by prune_disk, then kept up to date by put
+        self.hits = {"memory": 0, "disk": 0, "miss": 0}
+        self.prune_disk()
+
+    def path_for(self, video_id, width, height):
+        return os.path.join(self.directory, f"{video_id}_{width}x{height}.png")
+
+    def get(self, video_id, width, height):
+        """Return the cached pixmap or None, loading it from disk into memory if needed"""
+        key = (video_id, width, height)
+        with self.lock:
+            pixmap = self.pixmaps.get(key)
+            if pixmap is not None:
+                self.pixmaps.move_to_end(key)
+                self.hits["memory"] += 1
+                return pixmap
+        path = self.path_for(video_id, width, height)
+        pixmap = QPixmap(path) if os.path.exists(path) else QPixmap()
+        if pixmap.isNull():
+            with self.lock:
+                self.hits["miss"] += 1
+            return None
+        try:
+            os.utime(path)  # Recently shown tiles survive disk pruning
+        except OSError:
+            pass
+        with self.lock:
+            self.hits["disk"] += 1
+        self.remember(key, pixmap)
+        return pixmap
+
+    def put(self, video_id, width, height, pixmap):
+        self.remember((video_id, width, height), pixmap)
+        path = self.path_for(video_id, width, height)
+        try:
+            if not pixmap.save(path + ".part", "PNG"):
+                return
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(path + ".part", path)
+            size = os.path.getsize(path)
+        except OSError as e:
+            print(f"ThumbnailCache: Couldn't save {video_id}: {e}")
+            return
+        with self.lock:
+            self.disk_bytes += size - previous
+            over_budget = self.disk_bytes > self.disk_budget
+        if over_budget:
+            self.prune_disk(int(self.disk_budget * PRUNE_TARGET))
+
+    def remember(self, key, pixmap):
+        with self.lock:
+            previous = self.pixmaps.pop(key, None)
+            if previous is not None:
+                self.memory_bytes -= pixmap_bytes(previous)
+            self.pixmaps[key] = pixmap
+            self.memory_bytes += pixmap_bytes(pixmap)
+            while self.memory_bytes > self.memory_budget and len(self.pixmaps) > 1:
+                _, evicted = self.pixmaps.popitem(last=False)
+                self.memory_bytes -= pixmap_bytes(evicted)
+
+    def prune_disk(self, target=None):
+        """Delete the least recently used files until the directory fits its budget, or target bytes"""
+        target = self.disk_budget if target is None else target
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if name.endswith(".part") and stat.st_mtime < time.time() - 60:
+                os.remove(path)  # Left behind by a crash mid-write
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        with self.lock:
+            self.disk_bytes = total
+
+    def stats(self):
+        with self.lock:
+            return {**self.hits, "pixmaps": len(self.pixmaps), "memory_bytes": self.memory_bytes}
+
+_thumbnail_cache = None
+_thumbnail_cache_lock = threading.Lock()
+
+def get_thumbnail_cache():
+    global _thumbnail_cache
+    with _thumbnail_cache_lock:
+        if _thumbnail_cache is None:
+            _thumbnail_cache = ThumbnailCache()
+    return _thumbnail_cache
@@ -0,0 +1,83 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from components import http_client
+
+FETCH_CONCURRENCY = 8  # Thumbnail requests in flight across every grid, half of http_client's per-host pool
+CONNECT_TIMEOUT = 3
+DEADLINE = 8  # Seconds a thumbnail may take in total before its tile keeps the placeholder
+BLOCK_SIZE = 64 * 1024
+
+def download_first(urls):
+    """Bytes of the first of urls that downloads, all of them sharing one deadline"""
+    deadline = time.monotonic() + DEADLINE
+    for url in urls[:-1]:
+        try:
+            return download(url, deadline)
+        except TimeoutError:
+            raise  # No time left for the fallbacks
+        except Exception as e:
+            print(f"ThumbnailFetcher: {url} failed, trying the next format: {e}")
+    return download(urls[-1], deadline)
+
+def download(url, deadline):
+    timeout = max(0.1, deadline - time.monotonic())
+    response = http_client.get(url, stream=True, timeout=(min(CONNECT_TIMEOUT, timeout), timeout))
+    try:
+        response.raise_for_status()
+        blocks = []
+        for block in response.iter_content(BLOCK_SIZE):
+            # The read timeout only bounds each read, a trickling server could go on forever
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Thumbnail took longer than {DEADLINE}s: {url}")
+            blocks.append(block)
+    finally:
+        response.close()
+    return b"".join(blocks)
+
+class ThumbnailFetcher:
+    """Shared bounded pool for thumbnail downloads, one request per URL however many tiles want it"""
+
+    def __init__(self, workers=FETCH_CONCURRENCY):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="thumbnails")
+        self.in_flight = {}  # urls -> Future
+        self.lock = threading.Lock()
+
+    def fetch(self, url, *fallbacks):
+        """Return a Future with the image bytes, shared with any fetch of the same URLs still running
+
+        Fallback URLs are tried in order when the ones before them fail, e.g. a
+        JPEG for a video that has no WebP thumbnail.
+        """
+        urls = (url, *fallbacks)
+        with self.lock:
+            future = self.in_flight.get(urls)
+            if future is not None:
+                return future
+            future = self.in_flight[urls] = self.executor.submit(download_first, urls)
+        # Outside the lock, the callback runs right away if the download already finished
+        future.add_done_callback(lambda done, urls=urls: self.forget(urls, done))
+        return future
+
+    def forget(self, urls, future):
+        with self.lock:
+            if self.in_flight.get(urls) is future:
+                del self.in_flight[urls]
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+_fetcher = None
+_fetcher_lock = threading.Lock()
+
+def get_thumbnail_fetcher():
+    global _fetcher
+    with _fetcher_lock:
+        if _fetcher is None:
+            _fetcher = ThumbnailFetcher()
+    return _fetcher
+
+def shutdown_thumbnail_fetcher():
+    with _fetcher_lock:
+        if _fetcher is not None:
+            _fetcher.shutdown()
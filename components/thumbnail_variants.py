@@ -0,0 +1,39 @@
+import math
+from PySide6.QtGui import QGuiApplication, QImageReader
+
+# Sizes i.ytimg.com serves for every video, smallest first; sddefault and maxresdefault often 404
+VARIANTS = [
+    ("default", 120, 90),
+    ("mqdefault", 320, 180),
+    ("hqdefault", 480, 360),
+]
+
+_webp_supported = None
+
+def webp_supported():
+    """Whether Qt's image plugins can decode WebP, it's about a third smaller than the JPEG"""
+    global _webp_supported
+    if _webp_supported is None:
+        _webp_supported = b"webp" in [bytes(fmt) for fmt in QImageReader.supportedImageFormats()]
+    return _webp_supported
+
+def screen_ratio():
+    """Device pixel ratio of the primary screen, call from the GUI thread"""
+    screen = QGuiApplication.primaryScreen()
+    return screen.devicePixelRatio() if screen else 1.0
+
+def pick_variant(width, height, ratio=1.0):
+    """Smallest variant covering width x height logical pixels at the given device pixel ratio"""
+    need_width, need_height = math.ceil(width * ratio), math.ceil(height * ratio)
+    for name, variant_width, variant_height in VARIANTS:
+        if variant_width >= need_width and variant_height >= need_height:
+            return name
+    return VARIANTS[-1][0]
+
+def thumbnail_urls(video_id, width, height, ratio=1.0):
+    """Candidate URLs for a video's thumbnail at a display size, the preferred format first"""
+    name = pick_variant(width, height, ratio)
+    urls = [f"https://i.ytimg.com/vi/{video_id}/{name}.jpg"]
+    if webp_supported():
+        urls.insert(0, f"https://i.ytimg.com/vi_webp/{video_id}/{name}.webp")
+    return urls
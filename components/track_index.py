@@ -0,0 +1,119 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from components.appdata import app_data_dir
+
+RANK_CANDIDATES = 200
+
+class TrackIndex:
+    """Full-text index of every track the app has seen, for instant local matches while a search is in flight"""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(app_data_dir(), "tracks.db")
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS tracks (
+                rowid INTEGER PRIMARY KEY,
+                video_id TEXT UNIQUE NOT NULL,
+                title TEXT NOT NULL,
+                channel TEXT NOT NULL,
+                thumbnail TEXT,
+                seen_at REAL NOT NULL
+            );
+        """)
+        self.has_fts = self.create_fts()
+        self.conn.commit()
+
+    def create_fts(self):
+        # Some SQLite builds ship without FTS5, LIKE matching still works there, just slower
+        try:
+            self.conn.executescript("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS tracks_fts USING fts5(
+                    title, channel, content='tracks', content_rowid='rowid',
+                    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+                );
+                CREATE TRIGGER IF NOT EXISTS tracks_ai AFTER INSERT ON tracks BEGIN
+                    INSERT INTO tracks_fts (rowid, title, channel) VALUES (new.rowid, new.title, new.channel);
+                END;
+                CREATE TRIGGER IF NOT EXISTS tracks_ad AFTER DELETE ON tracks BEGIN
+                    INSERT INTO tracks_fts (tracks_fts, rowid, title, channel) VALUES ('delete', old.rowid, old.title, old.channel);
+                END;
+                CREATE TRIGGER IF NOT EXISTS tracks_au AFTER UPDATE OF title, channel ON tracks BEGIN
+                    INSERT INTO tracks_fts (tracks_fts, rowid, title, channel) VALUES ('delete', old.rowid, old.title, old.channel);
+                    INSERT INTO tracks_fts (rowid, title, channel) VALUES (new.rowid, new.title, new.channel);
+                END;
+            """)
+            return True
+        except sqlite3.OperationalError as e:
+            print(f"TrackIndex: FTS5 unavailable, falling back to LIKE matching: {e}")
+            return False
+
+    def add_tracks(self, tracks):
+        """Insert or refresh search_youtube track dicts"""
+        now = time.time()
+        rows = [(tr["video_id"], tr["title"], tr["name"], tr.get("thumbnail"), now) for tr in tracks]
+        with self.lock:
+            self.conn.executemany("""
+                INSERT INTO tracks (video_id, title, channel, thumbnail, seen_at) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (video_id) DO UPDATE SET
+                    title = excluded.title, channel = excluded.channel,
+                    thumbnail = excluded.thumbnail, seen_at = excluded.seen_at
+            """, rows)
+            self.conn.commit()
+
+    def search(self, query, limit=20):
+        """Return matching tracks in search_youtube's dict shape, best matches first"""
+        words = re.findall(r"\w+", query.lower())
+        if not words:
+            return []
+        with self.lock:
+            if self.has_fts:
+                # Every word has to match, the last one may still be half typed. Letting FTS rank
+                # every hit of a common word is slow on a big index, so only the most recently
+                # indexed candidates are ranked
+                match = " ".join(f'"{word}"*' for word in words)
+                rows = self.conn.execute("""
+                    SELECT t.video_id, t.title, t.channel, t.thumbnail FROM tracks_fts
+                    JOIN tracks t ON t.rowid = tracks_fts.rowid
+                    WHERE tracks_fts MATCH ? ORDER BY tracks_fts.rowid DESC LIMIT ?
+                """, (match, RANK_CANDIDATES)).fetchall()
+            else:
+                conditions = " AND ".join("(title || ' ' || channel) LIKE ?" for _ in words)
+                rows = self.conn.execute(
+                    f"SELECT video_id, title, channel, thumbnail FROM tracks WHERE {conditions} ORDER BY rowid DESC LIMIT ?",
+                    [f"%{word}%" for word in words] + [RANK_CANDIDATES]
+                ).fetchall()
+        rows.sort(key=lambda row: -self.score(words, row[1], row[2]))
+        return [
+            {"video_id": video_id, "title": title, "name": channel, "thumbnail": thumbnail}
+            for video_id, title, channel, thumbnail in rows[:limit]
+        ]
+
+    def score(self, words, title, channel):
+        # Words starting a title word count double, a match on the channel counts once
+        title_words = re.findall(r"\w+", title.lower())
+        channel_words = re.findall(r"\w+", channel.lower())
+        total = 0
+        for word in words:
+            if any(w.startswith(word) for w in title_words):
+                total += 2
+            elif any(w.startswith(word) for w in channel_words):
+                total += 1
+        return total
+
+    def count(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM tracks").fetchone()[0]
+
+_track_index = None
+_track_index_lock = threading.Lock()
+
+def get_track_index():
+    global _track_index
+    with _track_index_lock:
+        if _track_index is None:
+            _track_index = TrackIndex()
+    return _track_index
@@ -6,14 +6,27 @@ import sys
 from PySide6.QtCore import Qt, QSize, QFile, QTextStream, QThread, Signal, QTimer, QPropertyAnimation, Property
 from PySide6.QtGui import QIcon, QFontDatabase, QFont, QColor, QImage, QPixmap, QPainter, QPainterPath, QTransform, QPen
 from components.gradient_label import GradientLabel
-from components.playlist import search_youtube
+from components.playlist import SearchPager, search_youtube
+from components.extraction_service import get_extraction_service, shutdown_extraction_service
+from components.prefetcher import StreamPrefetcher
+from components.prefix_cache import PrefixCache
+from components.search_cache import normalize_query
+from components.track_index import get_track_index
+from components.quota import PRIORITY_CATEGORY, PRIORITY_INTERACTIVE, get_quota_ledger, is_quota_error
 from components.recognizer import AudioRecognizer
 from io import BytesIO
 from components.clickableimage import ClickableImage
 from components.playbar import PlayBar
-import requests
+from components.playback_engine import PlaybackEngine
+from components.audio_cache import get_audio_cache
+from components.thumbnail_fetcher import get_thumbnail_fetcher, shutdown_thumbnail_fetcher
+from components.thumbnail_cache import get_thumbnail_cache
+from components.thumbnail_variants import screen_ratio, thumbnail_urls
+import math
+import multiprocessing
 import uuid
 import os
+from concurrent.futures import CancelledError, ThreadPoolExecutor, as_completed
 from pathlib import Path
 import sys
 import os
@@ -27,34 +40,109 @@ def resource_path(relative_path):
 # Example usage:
 image = QImage(resource_path('assets/Banner.png'))
 
+# Sections fetched together when the home page loads: name -> (query, max_results)
+HOME_SECTIONS = {
+    "weekly_top": ("Coke Studio", 25),  # Fetch 25 for cache
+    "mood_songs": ("Mood Songs", 20),
+    "new_releases": ("New music releases", 25),
+}
+HOME_CONCURRENCY = 3
+PAGE_FETCH_DISTANCE = 300  # Show more rows, or fetch the next page, when scrolled this close (px) to the bottom
+FEED_ROW_HEIGHT = 230  # A row of tiles with their labels and margins, px
+TILES_PER_ROW = 5
+MAX_PAGE_SIZE = 50  # Most results search.list returns in one call, and a fixed size keeps the search cache key stable
+SEARCH_DEBOUNCE_MS = 400  # Wait for a pause in typing before searching
+MIN_LIVE_QUERY = 3  # Shorter queries only search on submit, every search costs 100 quota units
+LOCAL_RESULTS = 10  # Tracks shown from the local index while a search is in flight
+VISIBLE_PREFETCH_DELAY_MS = 800  # Let scrolling settle before picking visible tiles to pre-resolve
+VISIBLE_PREFETCH_LIMIT = 4  # Visible tiles pre-resolved per settle
+TILE_WIDTH, TILE_HEIGHT = 140, 150
+
+def format_duration(seconds):
+    if seconds is None:
+        return None
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+def to_track_info(tracks):
+    return [
+        {
+            "name": track['title'][:30],
+            "artists": track["name"][:30],
+            "album_image": track["thumbnail"],
+            "url": track['video_id'],
+            "duration": format_duration(track.get("duration")),
+            "views": track.get("views"),
+        } for track in tracks
+    ]
+
+def fetch_track_info(query, max_results, priority=PRIORITY_CATEGORY):
+    return to_track_info(search_youtube(query, max_results, priority))
+
 # Thread for fetching search results
 class SearchWorker(QThread):
     results_fetched = Signal(list)
     error_occurred = Signal(str)
 
-    def __init__(self, query, max_results):
+    def __init__(self, query, max_results, priority=PRIORITY_CATEGORY):
         super().__init__()
         self.query = query
         self.max_results = max_results
+        self.priority = priority
 
     def run(self):
         try:
             print(f"SearchWorker: Fetching results for query '{self.query}' with max_results={self.max_results}")
-            tracks = search_youtube(self.query, self.max_results)
-            print(f"SearchWorker: Found {len(tracks)} tracks")
-            track_info = [
-                {
-                    "name": track['title'][:30],
-                    "artists": track["name"][:30],
-                    "album_image": track["thumbnail"],
-                    "url": track['video_id']
-                } for track in tracks
-            ]
+            track_info = fetch_track_info(self.query, self.max_results, self.priority)
+            print(f"SearchWorker: Found {len(track_info)} tracks")
             self.results_fetched.emit(track_info)
         except Exception as e:
             print(f"SearchWorker: Error occurred: {str(e)}")
             self.error_occurred.emit(str(e))
 
+# Thread for fetching the next page of a paginated search
+class PageWorker(QThread):
+    page_fetched = Signal(object, list)  # Emits the pager with its new tracks
+    error_occurred = Signal(object, str)
+
+    def __init__(self, pager):
+        super().__init__()
+        self.pager = pager
+
+    def run(self):
+        try:
+            track_info = to_track_info(self.pager.next_page())
+            print(f"PageWorker: Page {self.pager.pages_loaded} of '{self.pager.query}' has {len(track_info)} tracks")
+            self.page_fetched.emit(self.pager, track_info)
+        except Exception as e:
+            print(f"PageWorker: Error occurred: {str(e)}")
+            self.error_occurred.emit(self.pager, str(e))
+
+# Thread for fetching several sections concurrently, emitting each as it completes
+class SectionLoader(QThread):
+    section_loaded = Signal(str, list)
+    error_occurred = Signal(str, str)
+
+    def __init__(self, sections, max_workers=HOME_CONCURRENCY):
+        super().__init__()
+        self.sections = sections
+        self.max_workers = max_workers
+
+    def run(self):
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(fetch_track_info, query, max_results): name
+                for name, (query, max_results) in self.sections.items()
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    track_info = future.result()
+                    print(f"SectionLoader: Loaded {len(track_info)} tracks for '{name}'")
+                    self.section_loaded.emit(name, track_info)
+                except Exception as e:
+                    print(f"SectionLoader: Error loading '{name}': {str(e)}")
+                    self.error_occurred.emit(name, str(e))
+
 # Thread for audio recognition
 class RecognitionWorker(QThread):
     recognition_finished = Signal(dict)
@@ -78,7 +166,16 @@ class RecognitionWorker(QThread):
             self.recognizer.clean_up()
             self.recognizer = None
 
-# Thread for asynchronous image loading
+# Thread that starts and primes the yt-dlp worker processes while the splash screen is up
+class ExtractorWarmupWorker(QThread):
+    def run(self):
+        try:
+            get_extraction_service().warm_up()
+        except Exception as e:
+            # Not fatal, the first play just pays the setup cost itself
+            print(f"Extractor warm-up failed: {e}")
+
+# Thread for asynchronous image loading, tiles are emitted as their downloads complete
 class ImageLoader(QThread):
     image_loaded = Signal(dict, QPixmap)  # Emits the whole track dict
     error_occurred = Signal(str)
@@ -86,29 +183,61 @@ class ImageLoader(QThread):
     def __init__(self, track_info):
         super().__init__()
         self.track_info = track_info
+        # Tiles are rendered at the screen's physical resolution so they stay sharp on HiDPI
+        self.ratio = screen_ratio()
+        self.width = math.ceil(TILE_WIDTH * self.ratio)
+        self.height = math.ceil(TILE_HEIGHT * self.ratio)
 
     def run(self):
+        cache = get_thumbnail_cache()
+        fetcher = get_thumbnail_fetcher()
+        futures = {}  # Future -> tracks sharing that thumbnail
         for tr in self.track_info:
-            try:
-                response = requests.get(tr["album_image"], timeout=5)
-                response.raise_for_status()
-                image_data = BytesIO(response.content)
-                pixmap = QPixmap()
-                pixmap.loadFromData(image_data.read())
-                pixmap = pixmap.scaled(140, 150, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
-                rounded_pixmap = QPixmap(140, 150)
-                rounded_pixmap.fill(Qt.transparent)
-                painter = QPainter(rounded_pixmap)
-                path = QPainterPath()
-                path.addRoundedRect(0, 0, 140, 150, 10, 10)
-                painter.setClipPath(path)
-                painter.drawPixmap(0, 0, pixmap)
-                painter.end()
-                self.image_loaded.emit(tr, rounded_pixmap)
-            except Exception:
-                placeholder_pixmap = QPixmap(140, 150)
-                placeholder_pixmap.fill(Qt.gray)
-                self.image_loaded.emit(tr, placeholder_pixmap)
+            # Tiles seen before, on any page or in an earlier session, skip the download and processing
+            pixmap = cache.get(tr["url"], self.width, self.height)
+            if pixmap is not None:
+                pixmap.setDevicePixelRatio(self.ratio)
+                self.image_loaded.emit(tr, pixmap)
+                continue
+            # The smallest variant that covers the tile, the search result's thumbnail as a last resort
+            urls = thumbnail_urls(tr["url"], TILE_WIDTH, TILE_HEIGHT, self.ratio)
+            if tr.get("album_image") and tr["album_image"] not in urls:
+                urls.append(tr["album_image"])
+            futures.setdefault(fetcher.fetch(*urls), []).append(tr)
+        for future in as_completed(futures):
+            pixmap = self.make_tile(future)
+            if pixmap is None:
+                pixmap = QPixmap(TILE_WIDTH, TILE_HEIGHT)
+                pixmap.fill(Qt.gray)
+            else:
+                for tr in futures[future]:
+                    cache.put(tr["url"], self.width, self.height, pixmap)
+                pixmap.setDevicePixelRatio(self.ratio)
+            for tr in futures[future]:
+                self.image_loaded.emit(tr, pixmap)
+
+    def make_tile(self, future):
+        try:
+            image_data = BytesIO(future.result())
+            pixmap = QPixmap()
+            if not pixmap.loadFromData(image_data.read()):
+                return None
+            # Thumbnails are 16:9 or 4:3 and tiles nearly square: fill the tile and crop the sides, don't stretch
+            pixmap = pixmap.scaled(self.width, self.height, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+            left = (pixmap.width() - self.width) // 2
+            top = (pixmap.height() - self.height) // 2
+            rounded_pixmap = QPixmap(self.width, self.height)
+            rounded_pixmap.fill(Qt.transparent)
+            painter = QPainter(rounded_pixmap)
+            path = QPainterPath()
+            radius = 10 * self.ratio
+            path.addRoundedRect(0, 0, self.width, self.height, radius, radius)
+            painter.setClipPath(path)
+            painter.drawPixmap(0, 0, pixmap, left, top, self.width, self.height)
+            painter.end()
+            return rounded_pixmap
+        except (Exception, CancelledError):  # CancelledError isn't an Exception, downloads are cancelled on close
+            return None
 
 # Animated Circle Widget
 class AnimatedCircle(QWidget):
@@ -195,6 +324,19 @@ class MainWindow(QWidget):
         self.splash.show()
         QApplication.processEvents()
 
+        self.warmup_worker = ExtractorWarmupWorker()
+        self.warmup_worker.start(QThread.LowPriority)
+
+        # Outlives the play bar so the queued next track stays ready across clicks
+        self.playback_engine = PlaybackEngine(self)
+
+        # Pre-resolves streams for hovered and on-screen tiles so a click only has to start playback
+        self.prefetcher = StreamPrefetcher()
+        self.prefetcher.start(QThread.LowestPriority)
+        self.visible_prefetch_timer = QTimer(self)
+        self.visible_prefetch_timer.setSingleShot(True)
+        self.visible_prefetch_timer.timeout.connect(self.prefetch_visible_tiles)
+
         # Font setup
         font_id = QFontDatabase.addApplicationFont(resource_path("assets/fonts/Poppins-Regular.ttf"))
         if font_id != -1:
@@ -504,7 +646,18 @@ class MainWindow(QWidget):
         search_scroll_area.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         search_scroll_area.setStyleSheet("QScrollArea { border: none; }")
         self.pages.addWidget(search_scroll_area)
+        self.search_scroll_area = search_scroll_area
         search_button.clicked.connect(self.perform_search)
+        self.inputfield.returnPressed.connect(self.perform_search)
+
+        # Search as you type, once typing pauses
+        self.search_prefix_cache = PrefixCache()
+        self.instant_query = None
+        self.search_debounce = QTimer(self)
+        self.search_debounce.setSingleShot(True)
+        self.search_debounce.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_debounce.timeout.connect(self.perform_live_search)
+        self.inputfield.textChanged.connect(self.on_search_text_changed)
 
         # Recognize page
         recognize_layout = QVBoxLayout()
@@ -782,16 +935,40 @@ class MainWindow(QWidget):
         content_layout.addWidget(self.pages, 3)
         main_layout.addLayout(content_layout)
 
-        self.playbar = None
+        # One play bar for the whole session, shown on the first click and hidden by its close button
+        self.playbar = PlayBar(self, engine=self.playback_engine)
+        self.playbar.hide()
+        main_layout.addWidget(self.playbar)
+        self.home_loader = None
         self.search_worker = None
         self.artist_search_worker = None
         self.recognition_worker = None
         self.image_loaders = []  # List to track all ImageLoader threads
+        self.page_workers = []  # PageWorker threads still running
+
+        # Grid pages that load more results as they are scrolled
+        self.paged_feeds = {}
+        for name, scroll_area in [
+            ("playlists", self.my_playlists_page), ("pop", self.pop_genre_page), ("rock", self.rock_genre_page),
+            ("most_played", self.played_page), ("search", self.search_scroll_area)
+        ]:
+            scroll_area.verticalScrollBar().valueChanged.connect(lambda value, name=name: self.on_feed_scrolled(name))
+
+        # Whatever scrolls into view becomes a prefetch candidate once scrolling settles
+        self.pages.currentChanged.connect(self.on_page_changed)
+        for scroll_area in self.findChildren(QScrollArea):
+            scroll_area.verticalScrollBar().valueChanged.connect(self.schedule_visible_prefetch)
+            scroll_area.horizontalScrollBar().valueChanged.connect(self.schedule_visible_prefetch)
 
         # Initialize content after UI is rendered
         QTimer.singleShot(200, self.initialize_content)
 
     def initialize_content(self):
+        print(f"YouTube quota: {get_quota_ledger().remaining()} units left today")
+        stats = get_audio_cache().stats()
+        print(f"Audio cache: {stats['files']} tracks, {stats['bytes'] / 1024 / 1024:.0f}/{stats['budget'] / 1024 / 1024:.0f} MB, "
+              f"{stats['hits']} hits, {stats['misses']} misses, {stats['bytes_saved'] / 1024 / 1024:.0f} MB saved, "
+              f"{stats['evictions']} evictions")
         if not self.closing:
             self.perform_home_search()
         self.splash.close()
@@ -799,13 +976,31 @@ class MainWindow(QWidget):
     def perform_home_search(self):
         if self.closing or (hasattr(self, 'home_loaded') and self.home_loaded):
             return
-        self.search_worker = SearchWorker("Coke Studio", 25)  # Fetch 25 for cache
-        self.search_worker.results_fetched.connect(self.update_home_ui)
-        self.search_worker.error_occurred.connect(self.show_home_search_error)
-        self.search_worker.finished.connect(self.on_search_worker_finished)
-        self.search_worker.start()
+        # All home rows are fetched in parallel and filled in as each one arrives
+        self.home_section_handlers = {
+            "weekly_top": (self.update_home_ui, self.show_home_search_error),
+            "mood_songs": (self.update_mood_songs_ui, self.show_mood_songs_search_error),
+            "new_releases": (self.update_new_releases_ui, self.show_new_releases_search_error),
+        }
+        self.home_loader = SectionLoader(HOME_SECTIONS)
+        self.home_loader.section_loaded.connect(self.on_home_section_loaded)
+        self.home_loader.error_occurred.connect(self.on_home_section_error)
+        self.home_loader.finished.connect(self.on_home_loader_finished)
+        self.home_loader.start()
         self.home_loaded = True
 
+    def on_home_section_loaded(self, name, track_info):
+        if not self.closing:
+            self.home_section_handlers[name][0](track_info)
+            self.schedule_visible_prefetch()
+
+    def on_home_section_error(self, name, error):
+        if not self.closing:
+            self.home_section_handlers[name][1](error)
+
+    def on_home_loader_finished(self):
+        self.home_loader = None
+
     def perform_weekly_more_search(self):
         if self.closing or self.weekly_more_loaded:
             return
@@ -819,16 +1014,6 @@ class MainWindow(QWidget):
             self.search_worker.start()
         self.weekly_more_loaded = True
 
-    def perform_mood_songs_search(self):
-        if self.closing or (hasattr(self, 'mood_loaded') and self.mood_loaded):
-            return
-        self.search_worker = SearchWorker("Mood Songs", 20)
-        self.search_worker.results_fetched.connect(self.update_mood_songs_ui)
-        self.search_worker.error_occurred.connect(self.show_mood_songs_search_error)
-        self.search_worker.finished.connect(self.on_search_worker_finished)
-        self.search_worker.start()
-        self.mood_loaded = True
-
     def perform_mood_full_search(self):
         if self.closing or self.mood_full_loaded:
             return
@@ -842,16 +1027,6 @@ class MainWindow(QWidget):
             self.search_worker.start()
         self.mood_full_loaded = True
 
-    def perform_new_releases_search(self):
-        if self.closing or self.weekly_new_loaded:
-            return
-        self.search_worker = SearchWorker("New music releases", 25)
-        self.search_worker.results_fetched.connect(self.update_new_releases_ui)
-        self.search_worker.error_occurred.connect(self.show_new_releases_search_error)
-        self.search_worker.finished.connect(self.on_search_worker_finished)
-        self.search_worker.start()
-        self.weekly_new_loaded = True
-
     def perform_new_releases_full_search(self):
         if self.closing or self.weekly_new_loaded:
             return
@@ -863,54 +1038,105 @@ class MainWindow(QWidget):
             self.search_worker.error_occurred.connect(self.show_new_releases_search_error)
             self.search_worker.finished.connect(self.on_search_worker_finished)
             self.search_worker.start()
+        self.weekly_new_loaded = True
 
     def perform_playlists_search(self):
         if self.closing or self.playlists_loaded:
             return
-        self.search_worker = SearchWorker("Top Playlists", 25)
-        self.search_worker.results_fetched.connect(self.update_playlists_ui)
-        self.search_worker.error_occurred.connect(self.show_playlists_search_error)
-        self.search_worker.finished.connect(self.on_search_worker_finished)
-        self.search_worker.start()
+        self.start_paged_feed("playlists", "Top Playlists", self.playlists_layout, self.my_playlists_page,
+                              self.show_playlists_search_error, "No Playlists Found")
         self.playlists_loaded = True
 
     def perform_pop_search(self):
         if self.closing or self.pop_loaded:
             return
-        self.search_worker = SearchWorker("Pop music", 25)
-        self.search_worker.results_fetched.connect(self.update_pop_ui)
-        self.search_worker.error_occurred.connect(self.show_pop_search_error)
-        self.search_worker.finished.connect(self.on_search_worker_finished)
-        self.search_worker.start()
+        self.start_paged_feed("pop", "Pop music", self.pop_layout, self.pop_genre_page,
+                              self.show_pop_search_error, "No Pop Songs Found")
         self.pop_loaded = True
 
     def perform_rock_search(self):
         if self.closing or self.rock_loaded:
             return
-        self.search_worker = SearchWorker("Rock music", 25)
-        self.search_worker.results_fetched.connect(self.update_rock_ui)
-        self.search_worker.error_occurred.connect(self.show_rock_search_error)
-        self.search_worker.finished.connect(self.on_search_worker_finished)
-        self.search_worker.start()
+        self.start_paged_feed("rock", "Rock music", self.rock_layout, self.rock_genre_page,
+                              self.show_rock_search_error, "No Rock Songs Found")
         self.rock_loaded = True
 
     def perform_most_played_search(self):
         if self.closing or self.most_played_loaded:
             return
-        self.search_worker = SearchWorker("Popular song of all time", 25)
-        self.search_worker.results_fetched.connect(self.update_most_played_ui)
-        self.search_worker.error_occurred.connect(self.show_most_played_search_error)
-        self.search_worker.finished.connect(self.on_search_worker_finished)
-        self.search_worker.start()
+        self.start_paged_feed("most_played", "Popular song of all time", self.most_played_layout, self.played_page,
+                              self.show_most_played_search_error, "No results found",
+                              sort_key=lambda tr: -(tr["views"] or 0))
         self.most_played_loaded = True
 
+    def on_search_text_changed(self, text):
+        if self.closing:
+            return
+        search_query = text.strip()
+        if len(search_query) < MIN_LIVE_QUERY:
+            self.search_debounce.stop()
+            return
+        self.show_instant_search_results(search_query)
+        self.search_debounce.start()
+
+    def show_instant_search_results(self, search_query):
+        # Show what we already know for this query or a prefix of it while the real search runs
+        if self.instant_query == normalize_query(search_query):
+            return True
+        track_info, exact = self.search_prefix_cache.lookup(search_query)
+        if not track_info:
+            track_info = self.local_track_matches(search_query)
+        if not track_info:
+            return False
+        self.instant_query = normalize_query(search_query)
+        feed = self.paged_feeds.pop("search", None)
+        if feed:
+            feed["pager"].cancel()  # Its grid goes with the layout, perform_search starts a new feed
+        self.clear_layout(self.search_layout)
+        header = QLabel(f"Results for '{search_query}'")
+        header.setObjectName("below-label")
+        self.search_layout.addWidget(header)
+        self.add_track_rows(self.search_layout, track_info)
+        self.search_layout.addStretch()
+        return True
+
+    def local_track_matches(self, query):
+        try:
+            return to_track_info(get_track_index().search(query, LOCAL_RESULTS))
+        except Exception as e:
+            print(f"Local track search failed: {e}")
+            return []
+
+    def add_track_rows(self, layout, track_info):
+        for i in range(0, len(track_info), 5):
+            row_layout = QHBoxLayout()
+            row_layout.setContentsMargins(10, 10, 10, 10)
+            row_layout.setSpacing(10)
+            for tr in track_info[i:i+5]:
+                row_layout.addLayout(self.create_track_tile(tr))
+            layout.addLayout(row_layout)
+        image_loader = ImageLoader(track_info)
+        self.image_loaders.append(image_loader)
+        image_loader.image_loaded.connect(self.set_track_image)
+        image_loader.finished.connect(lambda: self.on_image_loader_finished(image_loader))
+        image_loader.start()
+
     def perform_search(self):
+        """Search for the query the user entered or clicked search for"""
+        self.run_search(PRIORITY_INTERACTIVE)
+
+    def perform_live_search(self):
+        # Typing pauses often, these searches mustn't dip into the quota kept for explicit ones
+        self.run_search(PRIORITY_CATEGORY)
+
+    def run_search(self, priority):
         if self.closing:
             return
-        if self.search_worker and self.search_worker.isRunning():
-            self.search_worker.quit()
-            self.search_worker.wait()
+        self.search_debounce.stop()
         search_query = self.inputfield.text().strip()
+        feed = self.paged_feeds.get("search")
+        if feed and normalize_query(feed["pager"].query) == normalize_query(search_query) and (feed["worker"] or feed["grid"] is not None):
+            return  # Already showing or fetching this query
         if not search_query:
             self.clear_layout(self.search_layout)
             no_results_label = QLabel("Please enter a search query")
@@ -919,16 +1145,15 @@ class MainWindow(QWidget):
             self.search_layout.addWidget(no_results_label)
             return
         print(f"Performing search for: {search_query}")
-        self.clear_layout(self.search_layout)  # Clear layout before starting search
-        loading_label = QLabel("Searching...")
-        loading_label.setObjectName("no-playlist")
-        loading_label.setAlignment(Qt.AlignCenter)
-        self.search_layout.addWidget(loading_label)
-        self.search_worker = SearchWorker(search_query, 5)
-        self.search_worker.results_fetched.connect(self.update_search_ui)
-        self.search_worker.error_occurred.connect(self.show_search_error)
-        self.search_worker.finished.connect(self.on_search_worker_finished)
-        self.search_worker.start()
+        if not self.show_instant_search_results(search_query):
+            self.clear_layout(self.search_layout)  # Clear layout before starting search
+            loading_label = QLabel("Searching...")
+            loading_label.setObjectName("no-playlist")
+            loading_label.setAlignment(Qt.AlignCenter)
+            self.search_layout.addWidget(loading_label)
+        self.start_paged_feed("search", search_query, self.search_layout, self.search_scroll_area,
+                              self.show_search_error, f"No results found for '{search_query}'",
+                              header=f"Results for '{search_query}'", priority=priority)
 
     def perform_artist_search(self):
         if self.closing:
@@ -946,16 +1171,186 @@ class MainWindow(QWidget):
             return
         print(f"Performing artist search for: {search_query}")
         self.clear_layout(self.artist_layout)  # Clear layout before starting search
-        loading_label = QLabel("Searching...")
-        loading_label.setObjectName("no-playlist")
-        loading_label.setAlignment(Qt.AlignCenter)
-        self.artist_layout.addWidget(loading_label)
-        self.artist_search_worker = SearchWorker(f"{search_query} popular songs", 4)
+        local_tracks = self.local_track_matches(search_query)
+        if local_tracks:
+            # Tracks we've seen before by this artist, until the search comes back
+            header = QLabel(f"Popular songs for '{search_query}'")
+            header.setObjectName("below-label")
+            self.artist_layout.addWidget(header)
+            self.add_track_rows(self.artist_layout, local_tracks)
+            self.artist_layout.addStretch()
+        else:
+            loading_label = QLabel("Searching...")
+            loading_label.setObjectName("no-playlist")
+            loading_label.setAlignment(Qt.AlignCenter)
+            self.artist_layout.addWidget(loading_label)
+        self.artist_search_worker = SearchWorker(f"{search_query} popular songs", 4, PRIORITY_INTERACTIVE)
         self.artist_search_worker.results_fetched.connect(self.update_artist_ui)
         self.artist_search_worker.error_occurred.connect(self.show_artist_search_error)
         self.artist_search_worker.finished.connect(self.on_artist_search_worker_finished)
         self.artist_search_worker.start()
 
+    def start_paged_feed(self, name, query, layout, scroll_area, on_error, empty_text, header=None,
+                         priority=PRIORITY_CATEGORY, sort_key=None):
+        # Replaces any earlier feed with this name; its late pages are ignored
+        if name in self.paged_feeds:
+            self.paged_feeds[name]["pager"].cancel()
+        self.paged_feeds[name] = {
+            "pager": SearchPager(query, first_page_size=MAX_PAGE_SIZE, page_size=MAX_PAGE_SIZE, priority=priority),
+            "layout": layout,
+            "scroll_area": scroll_area,
+            "on_error": on_error,
+            "empty_text": empty_text,
+            "header": header,
+            "worker": None,
+            "grid": None,
+            "row": None,
+            "tracks": [],
+            "pending": [],  # Fetched tracks not shown yet, tiles are added as they scroll into reach
+            "sort_key": sort_key,  # Orders each page as it arrives, e.g. by view count
+        }
+        self.load_next_page(name)
+
+    def screen_tile_count(self, scroll_area):
+        """Enough tiles to fill the viewport and then some
+
+        Every page costs a 100-unit search.list call whatever its size, so pages are
+        fetched full and their tiles built a screen at a time.
+        """
+        height = max(scroll_area.viewport().height(), self.height())
+        rows = math.ceil(height / FEED_ROW_HEIGHT) + 1
+        return rows * TILES_PER_ROW
+
+    def load_next_page(self, name):
+        feed = self.paged_feeds.get(name)
+        if self.closing or not feed or feed["worker"] or not feed["pager"].has_more():
+            return
+        worker = PageWorker(feed["pager"])
+        feed["worker"] = worker
+        worker.page_fetched.connect(lambda pager, track_info, name=name: self.on_page_fetched(name, pager, track_info))
+        worker.error_occurred.connect(lambda pager, error, name=name: self.on_page_error(name, pager, error))
+        worker.finished.connect(lambda name=name, worker=worker: self.on_page_worker_finished(name, worker))
+        self.page_workers.append(worker)
+        worker.start()
+
+    def on_feed_scrolled(self, name):
+        feed = self.paged_feeds.get(name)
+        if not feed or feed["grid"] is None:
+            return
+        scroll_bar = feed["scroll_area"].verticalScrollBar()
+        if scroll_bar.maximum() - scroll_bar.value() > PAGE_FETCH_DISTANCE:
+            return
+        if feed["pending"]:
+            self.show_pending_tiles(name)
+        else:
+            self.load_next_page(name)
+
+    def on_page_fetched(self, name, pager, track_info):
+        feed = self.paged_feeds.get(name)
+        if self.closing or not feed or feed["pager"] is not pager:
+            return
+        layout = feed["layout"]
+        if feed["sort_key"]:
+            track_info = sorted(track_info, key=feed["sort_key"])
+        feed["tracks"].extend(track_info)
+        if name == "search":
+            self.search_prefix_cache.put(pager.query, feed["tracks"])
+            self.instant_query = None
+        if feed["grid"] is None:
+            self.clear_layout(layout)
+            if not track_info:
+                not_label = QLabel(feed["empty_text"])
+                not_label.setObjectName("no-playlist")
+                not_label.setAlignment(Qt.AlignCenter)
+                layout.addWidget(not_label)
+                return
+            if feed["header"]:
+                header = QLabel(feed["header"])
+                header.setObjectName("below-label")
+                layout.addWidget(header)
+            feed["grid"] = QVBoxLayout()
+            feed["grid"].setContentsMargins(0, 0, 0, 0)
+            layout.addLayout(feed["grid"])
+            layout.addStretch()
+        feed["pending"].extend(track_info)
+        self.show_pending_tiles(name)
+
+    def show_pending_tiles(self, name):
+        """Add another screenful of a feed's fetched tracks, finishing the last row first"""
+        feed = self.paged_feeds[name]
+        if not feed["pending"]:
+            return
+        count = self.screen_tile_count(feed["scroll_area"])
+        if feed["row"] is not None:
+            count += (TILES_PER_ROW - feed["row"].count()) % TILES_PER_ROW
+        track_info, feed["pending"] = feed["pending"][:count], feed["pending"][count:]
+        for tr in track_info:
+            if feed["row"] is None or feed["row"].count() >= TILES_PER_ROW:
+                feed["row"] = QHBoxLayout()
+                feed["row"].setContentsMargins(10, 10, 10, 10)
+                feed["row"].setSpacing(10)
+                feed["grid"].addLayout(feed["row"])
+            feed["row"].addLayout(self.create_track_tile(tr))
+
+        image_loader = ImageLoader(track_info)
+        self.image_loaders.append(image_loader)
+        image_loader.image_loaded.connect(self.set_track_image)
+        image_loader.finished.connect(lambda: self.on_image_loader_finished(image_loader))
+        image_loader.start()
+
+        self.schedule_visible_prefetch()
+
+    def on_page_error(self, name, pager, error):
+        feed = self.paged_feeds.get(name)
+        if self.closing or not feed or feed["pager"] is not pager:
+            return
+        if feed["grid"] is None:
+            feed["on_error"](error)
+        else:
+            print(f"Failed to load more results for '{pager.query}': {error}")
+
+    def on_page_worker_finished(self, name, worker):
+        if worker in self.page_workers:
+            self.page_workers.remove(worker)
+        feed = self.paged_feeds.get(name)
+        if feed and feed["worker"] is worker:
+            feed["worker"] = None
+
+    def create_track_tile(self, tr):
+        main_child_layout = QVBoxLayout()
+        main_child_layout.setContentsMargins(0, 0, 0, 0)
+        main_child_layout.setAlignment(Qt.AlignCenter)
+        main_child_layout.setSpacing(10)
+        image = ClickableImage(track_id=tr["url"])
+        placeholder = QPixmap(140, 150)
+        placeholder.fill(Qt.gray)
+        image.setPixmap(placeholder)
+        image.setCursor(Qt.PointingHandCursor)
+        image.setAlignment(Qt.AlignCenter)
+        image.setObjectName("image-weekly")
+        image.clicked.connect(
+            lambda checked, turl=tr["url"], tname=tr["name"], tartist=tr["artists"], tduration=tr.get("duration"):
+            self.on_image_click(turl, tname, tartist, tduration)
+        )
+        self.image_widgets[tr["url"]] = image
+        image.hovered.connect(self.prefetcher.hint_hovered)
+        main_child_layout.addWidget(image)
+        label_name = QLabel(tr["name"])
+        label_name.setObjectName("label-name")
+        label_name.setAlignment(Qt.AlignCenter)
+        label_name.setWordWrap(True)
+        label_name.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        main_child_layout.addWidget(label_name)
+        label_artist = QLabel(tr["artists"])
+        label_artist.setObjectName("artist-name")
+        label_artist.setAlignment(Qt.AlignCenter)
+        main_child_layout.addWidget(label_artist)
+        return main_child_layout
+
+    def set_track_image(self, track, pixmap):
+        if track["url"] in self.image_widgets:
+            self.image_widgets[track["url"]].setPixmap(pixmap)
+
     def start_recognition(self, event):
         if self.closing:
             return
@@ -992,7 +1387,7 @@ class MainWindow(QWidget):
             tracks = search_youtube(result['song_title'], 1)
             if tracks:
                 track = tracks[0]
-                self.on_image_click(track['video_id'], track['title'][:30], track['name'][:30])
+                self.on_image_click(track['video_id'], track['title'][:30], track['name'][:30], format_duration(track.get('duration')))
         except Exception:
             error_label = QLabel("Failed to play song")
             error_label.setObjectName("no-playlist")
@@ -1055,10 +1450,11 @@ class MainWindow(QWidget):
             image.setAlignment(Qt.AlignCenter)
             image.setObjectName("image-weekly")
             image.clicked.connect(
-                lambda checked, turl=tr["url"], tname=tr["name"], tartist=tr["artists"]:
-                self.on_image_click(turl, tname, tartist)
+                lambda checked, turl=tr["url"], tname=tr["name"], tartist=tr["artists"], tduration=tr.get("duration"):
+                self.on_image_click(turl, tname, tartist, tduration)
             )
             self.image_widgets[tr["url"]] = image
+            image.hovered.connect(self.prefetcher.hint_hovered)
             main_child_layout.addWidget(image)
             
             # Add track name
@@ -1098,8 +1494,6 @@ class MainWindow(QWidget):
         )
         image_loader.finished.connect(lambda: self.on_image_loader_finished(image_loader))
         image_loader.start()
-        
-        QTimer.singleShot(100, self.perform_mood_songs_search)
 
     def update_weekly_more_ui(self, track_info):
         self.clear_layout(self.weekly_more_layout)
@@ -1148,10 +1542,11 @@ class MainWindow(QWidget):
             image.setAlignment(Qt.AlignCenter)
             image.setObjectName("image-weekly")
             image.clicked.connect(
-                lambda checked, turl=tr["url"], tname=tr["name"], tartist=tr["artists"]:
-                self.on_image_click(turl, tname, tartist)
+                lambda checked, turl=tr["url"], tname=tr["name"], tartist=tr["artists"], tduration=tr.get("duration"):
+                self.on_image_click(turl, tname, tartist, tduration)
             )
             self.image_widgets[tr["url"]] = image
+            image.hovered.connect(self.prefetcher.hint_hovered)
             main_child_layout.addWidget(image)
             
             # Add track name
@@ -1188,8 +1583,6 @@ class MainWindow(QWidget):
         image_loader.image_loaded.connect(lambda track, pixmap: self.update_track_image(self.mood_songs_layout, track, pixmap, initial_tracks))
         image_loader.finished.connect(lambda: self.on_image_loader_finished(image_loader))
         image_loader.start()
-        
-        QTimer.singleShot(100, self.perform_new_releases_search)
 
     def update_mood_full_ui(self, track_info):
         self.clear_layout(self.mood_full_layout)
@@ -1238,10 +1631,11 @@ class MainWindow(QWidget):
             image.setAlignment(Qt.AlignCenter)
             image.setObjectName("image-weekly")
             image.clicked.connect(
-                lambda checked, turl=tr["url"], tname=tr["name"], tartist=tr["artists"]:
-                self.on_image_click(turl, tname, tartist)
+                lambda checked, turl=tr["url"], tname=tr["name"], tartist=tr["artists"], tduration=tr.get("duration"):
+                self.on_image_click(turl, tname, tartist, tduration)
             )
             self.image_widgets[tr["url"]] = image
+            image.hovered.connect(self.prefetcher.hint_hovered)
             main_child_layout.addWidget(image)
             
             # Add track name
@@ -1293,115 +1687,6 @@ class MainWindow(QWidget):
         image_loader.finished.connect(lambda: self.on_image_loader_finished(image_loader))
         image_loader.start()
 
-    def update_playlists_ui(self, track_info):
-        self.clear_layout(self.playlists_layout)
-        if not track_info:
-            not_label = QLabel("No Playlists Found")
-            not_label.setObjectName("no-playlist")
-            not_label.setAlignment(Qt.AlignCenter)
-            self.playlists_layout.addWidget(not_label)
-            return
-        image_loader = ImageLoader(track_info)
-        self.image_loaders.append(image_loader)
-        image_loader.image_loaded.connect(lambda track, pixmap: self.update_track_image(self.playlists_layout, track, pixmap, track_info, rows=True))
-        image_loader.finished.connect(lambda: self.on_image_loader_finished(image_loader))
-        image_loader.start()
-
-    def update_pop_ui(self, track_info):
-        self.clear_layout(self.pop_layout)
-        if not track_info:
-            not_label = QLabel("No Pop Songs Found")
-            not_label.setObjectName("no-playlist")
-            not_label.setAlignment(Qt.AlignCenter)
-            self.pop_layout.addWidget(not_label)
-            return
-        image_loader = ImageLoader(track_info)
-        self.image_loaders.append(image_loader)
-        image_loader.image_loaded.connect(lambda track, pixmap: self.update_track_image(self.pop_layout, track, pixmap, track_info, rows=True))
-        image_loader.finished.connect(lambda: self.on_image_loader_finished(image_loader))
-        image_loader.start()
-
-    def update_rock_ui(self, track_info):
-        self.clear_layout(self.rock_layout)
-        if not track_info:
-            not_label = QLabel("No Rock Songs Found")
-            not_label.setObjectName("no-playlist")
-            not_label.setAlignment(Qt.AlignCenter)
-            self.rock_layout.addWidget(not_label)
-            return
-        image_loader = ImageLoader(track_info)
-        self.image_loaders.append(image_loader)
-        image_loader.image_loaded.connect(lambda track, pixmap: self.update_track_image(self.rock_layout, track, pixmap, track_info, rows=True))
-        image_loader.finished.connect(lambda: self.on_image_loader_finished(image_loader))
-        image_loader.start()
-
-    def update_search_ui(self, track_info):
-        self.clear_layout(self.search_layout)
-        if not track_info:
-            no_results_label = QLabel(f"No results found for '{self.inputfield.text().strip()}'")
-            no_results_label.setObjectName("no-playlist")
-            no_results_label.setAlignment(Qt.AlignCenter)
-            self.search_layout.addWidget(no_results_label)
-            return
-        
-        # Add results header
-        results_header = QLabel(f"Results for '{self.inputfield.text().strip()}'")
-        results_header.setObjectName("below-label")
-        self.search_layout.addWidget(results_header)
-        
-        # Create horizontal layout for tracks
-        tracks_layout = QHBoxLayout()
-        tracks_layout.setContentsMargins(0, 0, 0, 0)
-        tracks_layout.setSpacing(20)
-        
-        for tr in track_info:
-            main_child_layout = QVBoxLayout()
-            main_child_layout.setContentsMargins(0, 0, 0, 0)
-            main_child_layout.setAlignment(Qt.AlignCenter)
-            main_child_layout.setSpacing(10)
-            
-            # Create the image widget with placeholder
-            image = ClickableImage(track_id=tr["url"])
-            placeholder = QPixmap(140, 150)
-            placeholder.fill(Qt.gray)
-            image.setPixmap(placeholder)
-            image.setCursor(Qt.PointingHandCursor)
-            image.setAlignment(Qt.AlignCenter)
-            image.setObjectName("image-weekly")
-            image.clicked.connect(
-                lambda checked, turl=tr["url"], tname=tr["name"], tartist=tr["artists"]:
-                self.on_image_click(turl, tname, tartist)
-            )
-            self.image_widgets[tr["url"]] = image
-            main_child_layout.addWidget(image)
-            
-            # Add track name
-            label_name = QLabel(tr["name"])
-            label_name.setObjectName("label-name")
-            label_name.setAlignment(Qt.AlignCenter)
-            label_name.setWordWrap(True)
-            label_name.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-            main_child_layout.addWidget(label_name)
-            
-            # Add artist name
-            label_artist = QLabel(tr["artists"])
-            label_artist.setObjectName("artist-name")
-            label_artist.setAlignment(Qt.AlignCenter)
-            main_child_layout.addWidget(label_artist)
-            
-            tracks_layout.addLayout(main_child_layout)
-        
-        # Add tracks layout to search layout
-        self.search_layout.addLayout(tracks_layout)
-        self.search_layout.addStretch()  # Push content to top
-        
-        # Load images asynchronously
-        image_loader = ImageLoader(track_info)
-        self.image_loaders.append(image_loader)
-        image_loader.image_loaded.connect(lambda track, pixmap: self.update_track_image(self.search_layout, track, pixmap, track_info))
-        image_loader.finished.connect(lambda: self.on_image_loader_finished(image_loader))
-        image_loader.start()
-
     def update_artist_ui(self, track_info):
         self.clear_layout(self.artist_layout)
         if not track_info:
@@ -1436,10 +1721,11 @@ class MainWindow(QWidget):
             image.setAlignment(Qt.AlignCenter)
             image.setObjectName("image-weekly")
             image.clicked.connect(
-                lambda checked, turl=tr["url"], tname=tr["name"], tartist=tr["artists"]:
-                self.on_image_click(turl, tname, tartist)
+                lambda checked, turl=tr["url"], tname=tr["name"], tartist=tr["artists"], tduration=tr.get("duration"):
+                self.on_image_click(turl, tname, tartist, tduration)
             )
             self.image_widgets[tr["url"]] = image
+            image.hovered.connect(self.prefetcher.hint_hovered)
             main_child_layout.addWidget(image)
             
             # Add track name
@@ -1469,20 +1755,6 @@ class MainWindow(QWidget):
         image_loader.finished.connect(lambda: self.on_image_loader_finished(image_loader))
         image_loader.start()
 
-    def update_most_played_ui(self, track_info):
-        self.clear_layout(self.most_played_layout)
-        if not track_info:
-            no_results_label = QLabel("No results found")
-            no_results_label.setObjectName("no-playlist")
-            no_results_label.setAlignment(Qt.AlignCenter)
-            self.most_played_layout.addWidget(no_results_label)
-            return
-        image_loader = ImageLoader(track_info)
-        self.image_loaders.append(image_loader)
-        image_loader.image_loaded.connect(lambda track, pixmap: self.update_track_image(self.most_played_layout, track, pixmap, track_info, rows=True))
-        image_loader.finished.connect(lambda: self.on_image_loader_finished(image_loader))
-        image_loader.start()
-
     def update_track_image(self, layout, track, pixmap, track_info, rows=False):
         if track["url"] in self.image_widgets:
             self.image_widgets[track["url"]].setPixmap(pixmap)
@@ -1491,11 +1763,7 @@ class MainWindow(QWidget):
         if layout.count() <= 1:  # Allow for header or empty layout
             self.clear_layout(layout)
             # Add header if applicable
-            if layout == self.search_layout:
-                header = QLabel(f"Results for '{self.inputfield.text().strip()}'")
-                header.setObjectName("below-label")
-                layout.addWidget(header)
-            elif layout == self.artist_layout:
+            if layout == self.artist_layout:
                 header = QLabel(f"Popular songs for '{self.artist_inputfield.text().strip()}'")
                 header.setObjectName("below-label")
                 layout.addWidget(header)
@@ -1518,10 +1786,11 @@ class MainWindow(QWidget):
                         image.setAlignment(Qt.AlignCenter)
                         image.setObjectName("image-weekly")
                         image.clicked.connect(
-                            lambda checked, turl=tr["url"], tname=tr["name"], tartist=tr["artists"]:
-                            self.on_image_click(turl, tname, tartist)
+                            lambda checked, turl=tr["url"], tname=tr["name"], tartist=tr["artists"], tduration=tr.get("duration"):
+                            self.on_image_click(turl, tname, tartist, tduration)
                         )
                         self.image_widgets[tr["url"]] = image
+                        image.hovered.connect(self.prefetcher.hint_hovered)
                         main_child_layout.addWidget(image)
                         label_name = QLabel(tr["name"])
                         label_name.setObjectName("label-name")
@@ -1553,10 +1822,11 @@ class MainWindow(QWidget):
                     image.setAlignment(Qt.AlignCenter)
                     image.setObjectName("image-weekly")
                     image.clicked.connect(
-                        lambda checked, turl=tr["url"], tname=tr["name"], tartist=tr["artists"]:
-                        self.on_image_click(turl, tname, tartist)
+                        lambda checked, turl=tr["url"], tname=tr["name"], tartist=tr["artists"], tduration=tr.get("duration"):
+                        self.on_image_click(turl, tname, tartist, tduration)
                     )
                     self.image_widgets[tr["url"]] = image
+                    image.hovered.connect(self.prefetcher.hint_hovered)
                     main_child_layout.addWidget(image)
                     label_name = QLabel(tr["name"])
                     label_name.setObjectName("label-name")
@@ -1578,81 +1848,85 @@ class MainWindow(QWidget):
 
     def show_home_search_error(self, error):
         self.clear_layout(self.main_track_layout)
-        error_label = QLabel("Failed to fetch tracks")
+        error_label = QLabel(self.search_error_text(error, "Failed to fetch tracks"))
         error_label.setObjectName("no-playlist")
         error_label.setAlignment(Qt.AlignCenter)
         self.main_track_layout.addWidget(error_label)
 
     def show_weekly_more_search_error(self, error):
         self.clear_layout(self.weekly_more_layout)
-        error_label = QLabel("Failed to fetch weekly top songs")
+        error_label = QLabel(self.search_error_text(error, "Failed to fetch weekly top songs"))
         error_label.setObjectName("no-playlist")
         error_label.setAlignment(Qt.AlignCenter)
         self.weekly_more_layout.addWidget(error_label)
 
     def show_mood_songs_search_error(self, error):
         self.clear_layout(self.mood_songs_layout)
-        error_label = QLabel("Failed to fetch mood songs")
+        error_label = QLabel(self.search_error_text(error, "Failed to fetch mood songs"))
         error_label.setObjectName("no-playlist")
         error_label.setAlignment(Qt.AlignCenter)
         self.mood_songs_layout.addWidget(error_label)
 
     def show_mood_full_search_error(self, error):
         self.clear_layout(self.mood_full_layout)
-        error_label = QLabel("Failed to fetch mood songs")
+        error_label = QLabel(self.search_error_text(error, "Failed to fetch mood songs"))
         error_label.setObjectName("no-playlist")
         error_label.setAlignment(Qt.AlignCenter)
         self.mood_full_layout.addWidget(error_label)
 
     def show_new_releases_search_error(self, error):
         self.clear_layout(self.new_releases_layout)
-        error_label = QLabel("Failed to fetch new releases")
+        error_label = QLabel(self.search_error_text(error, "Failed to fetch new releases"))
         error_label.setObjectName("no-playlist")
         error_label.setAlignment(Qt.AlignCenter)
         self.new_releases_layout.addWidget(error_label)
 
     def show_playlists_search_error(self, error):
         self.clear_layout(self.playlists_layout)
-        error_label = QLabel("Failed to fetch playlists")
+        error_label = QLabel(self.search_error_text(error, "Failed to fetch playlists"))
         error_label.setObjectName("no-playlist")
         error_label.setAlignment(Qt.AlignCenter)
         self.playlists_layout.addWidget(error_label)
 
     def show_pop_search_error(self, error):
         self.clear_layout(self.pop_layout)
-        error_label = QLabel("Failed to fetch pop songs")
+        error_label = QLabel(self.search_error_text(error, "Failed to fetch pop songs"))
         error_label.setObjectName("no-playlist")
         error_label.setAlignment(Qt.AlignCenter)
         self.pop_layout.addWidget(error_label)
 
     def show_rock_search_error(self, error):
         self.clear_layout(self.rock_layout)
-        error_label = QLabel("Failed to fetch rock songs")
+        error_label = QLabel(self.search_error_text(error, "Failed to fetch rock songs"))
         error_label.setObjectName("no-playlist")
         error_label.setAlignment(Qt.AlignCenter)
         self.rock_layout.addWidget(error_label)
 
     def show_search_error(self, error):
         self.clear_layout(self.search_layout)
-        error_label = QLabel("Failed to fetch results")
+        error_label = QLabel(self.search_error_text(error, "Failed to fetch results"))
         error_label.setObjectName("no-playlist")
         error_label.setAlignment(Qt.AlignCenter)
         self.search_layout.addWidget(error_label)
 
     def show_artist_search_error(self, error):
         self.clear_layout(self.artist_layout)
-        error_label = QLabel("Failed to fetch results")
+        error_label = QLabel(self.search_error_text(error, "Failed to fetch results"))
         error_label.setObjectName("no-playlist")
         error_label.setAlignment(Qt.AlignCenter)
         self.artist_layout.addWidget(error_label)
 
     def show_most_played_search_error(self, error):
         self.clear_layout(self.most_played_layout)
-        error_label = QLabel("Failed to fetch results")
+        error_label = QLabel(self.search_error_text(error, "Failed to fetch results"))
         error_label.setObjectName("no-playlist")
         error_label.setAlignment(Qt.AlignCenter)
         self.most_played_layout.addWidget(error_label)
 
+    def search_error_text(self, error, fallback):
+        # Running out of API quota is worth spelling out, anything else keeps the generic message
+        return error if is_quota_error(error) else fallback
+
     def clear_layout(self, layout):
         # Clear image_widgets for tracks in this layout
         for i in range(layout.count()):
@@ -1674,17 +1948,39 @@ class MainWindow(QWidget):
                 self.clear_layout(child_layout)
                 child_layout.deleteLater()
 
-    def on_image_click(self, track_url, track_name, track_artist):
-        if self.playbar:
+    def on_image_click(self, track_url, track_name, track_artist, duration=None):
+        self.playbar.show()
+        self.playbar.update_track_info(track_name, track_artist, duration or "0:00")
+        self.playbar.play_track(track_url, self.upcoming_tracks(track_url))
+
+    def upcoming_tracks(self, track_url):
+        """Video ids of the tiles after the clicked one on the current page, in the order they're shown"""
+        page = self.pages.currentWidget()
+        video_ids = [image.track_id for image in page.findChildren(ClickableImage)] if page else []
+        if track_url not in video_ids:
+            return []
+        return list(dict.fromkeys(video_ids[video_ids.index(track_url) + 1:]))
+
+    def schedule_visible_prefetch(self):
+        if not self.closing:
+            self.visible_prefetch_timer.start(VISIBLE_PREFETCH_DELAY_MS)
+
+    def on_page_changed(self, index):
+        # Hints from the page we left are no longer worth the work
+        self.prefetcher.cancel_pending()
+        self.schedule_visible_prefetch()
+
+    def prefetch_visible_tiles(self):
+        visible = []
+        for video_id, image in list(self.image_widgets.items()):
             try:
-                self.playbar.close_player()
-            except RuntimeError:
-                pass
-            self.playbar = None
-        self.playbar = PlayBar(self)
-        self.layout().addWidget(self.playbar)
-        self.playbar.update_track_info(track_name, track_artist, "3:45")
-        self.playbar.play_track(track_url)
+                if image.isVisible() and not image.visibleRegion().isEmpty():
+                    visible.append(video_id)
+            except RuntimeError:  # The tile was deleted when its layout was cleared
+                del self.image_widgets[video_id]
+            if len(visible) >= VISIBLE_PREFETCH_LIMIT:
+                break
+        self.prefetcher.hint_visible(visible)
 
     def activate_tab(self, button, page, search_func=None):
         for btn in [
@@ -1710,7 +2006,21 @@ class MainWindow(QWidget):
 
     def closeEvent(self, event):
         self.closing = True  # Prevent new threads
+        # Stop the extraction workers first, threads waiting on them then fail fast instead of timing out
+        shutdown_extraction_service()
+
         # Stop and clean up all threads
+        if self.warmup_worker.isRunning():
+            self.warmup_worker.wait(5000)
+        self.visible_prefetch_timer.stop()
+        self.prefetcher.stop()
+        self.prefetcher.wait(5000)
+        self.playback_engine.shutdown()
+
+        if self.home_loader and self.home_loader.isRunning():
+            self.home_loader.wait(5000)
+        self.home_loader = None
+
         if self.search_worker and self.search_worker.isRunning():
             self.search_worker.quit()
             self.search_worker.wait(5000)
@@ -1727,6 +2037,12 @@ class MainWindow(QWidget):
             self.recognition_worker.cleanup()
         self.recognition_worker = None
 
+        for worker in self.page_workers[:]:
+            if worker.isRunning():
+                worker.wait(5000)
+        self.page_workers = []
+
+        shutdown_thumbnail_fetcher()  # Queued downloads are cancelled so the loaders finish right away
         for loader in self.image_loaders[:]:  # Iterate over a copy to allow removal
             if loader.isRunning():
                 loader.quit()
@@ -1737,6 +2053,7 @@ class MainWindow(QWidget):
         super().closeEvent(event)
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Extraction workers re-launch this executable when frozen
     app = QApplication(sys.argv)
     try:
         window = MainWindow()
@@ -7,11 +7,13 @@ from PySide6.QtCore import Qt, QSize, QFile, QTextStream, QThread, Signal, QTime
 from PySide6.QtGui import QIcon, QFontDatabase, QFont, QColor, QImage, QPixmap, QPainter, QPainterPath, QTransform, QPen
 from components.gradient_label import GradientLabel
 from components.playlist import search_youtube
+from components.extraction_service import get_extraction_service, shutdown_extraction_service
 from components.recognizer import AudioRecognizer
 from io import BytesIO
 from components.clickableimage import ClickableImage
 from components.playbar import PlayBar
 import requests
+import multiprocessing
 import uuid
 import os
 from pathlib import Path
@@ -78,6 +80,15 @@ class RecognitionWorker(QThread):
             self.recognizer.clean_up()
             self.recognizer = None
 
+# Thread that starts and primes the yt-dlp worker processes while the splash screen is up
+class ExtractorWarmupWorker(QThread):
+    def run(self):
+        try:
+            get_extraction_service().warm_up()
+        except Exception as e:
+            # Not fatal, the first play just pays the setup cost itself
+            print(f"Extractor warm-up failed: {e}")
+
 # Thread for asynchronous image loading
 class ImageLoader(QThread):
     image_loaded = Signal(dict, QPixmap)  # Emits the whole track dict
@@ -206,6 +217,9 @@ class MainWindow(QWidget):
         self.splash.show()
         QApplication.processEvents()
 
+        self.warmup_worker = ExtractorWarmupWorker()
+        self.warmup_worker.start(QThread.LowPriority)
+
         # Font setup
         font_id = QFontDatabase.addApplicationFont(resource_path("assets/fonts/Poppins-Regular.ttf"))
         if font_id != -1:
@@ -1711,7 +1725,13 @@ class MainWindow(QWidget):
 
     def closeEvent(self, event):
         self.closing = True  # Prevent new threads
+        # Stop the extraction workers first, threads waiting on them then fail fast instead of timing out
+        shutdown_extraction_service()
+
         # Stop and clean up all threads
+        if self.warmup_worker.isRunning():
+            self.warmup_worker.wait(5000)
+
         if self.search_worker and self.search_worker.isRunning():
             self.search_worker.quit()
             self.search_worker.wait(5000)
@@ -1738,6 +1758,7 @@ class MainWindow(QWidget):
         super().closeEvent(event)
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Extraction workers re-launch this executable when frozen
     app = QApplication(sys.argv)
     try:
         window = MainWindow()